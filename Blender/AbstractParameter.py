@@ -35,6 +35,8 @@ individual license agreement.
 
 import struct
 import bpy
+import numpy as np
+from .keyEvaluation import evaluate_parameter
 from mathutils import Vector, Quaternion, Color
 from enum import Enum
 import math
@@ -65,6 +67,105 @@ class AnimHostRPC(Enum):
     STREAM_LOOP = 2
     BLOCK       = 3
 
+## Resolve the TRACER type of a parameter value
+def tracer_type_of(value) -> int:
+    if isinstance(value, bool):
+        return TRACERParamType.BOOL.value
+    elif isinstance(value, int):
+        return TRACERParamType.INT.value
+    elif isinstance(value, float):
+        return TRACERParamType.FLOAT.value
+    elif isinstance(value, Vector) and len(value) == 2:
+        return TRACERParamType.VECTOR2.value
+    elif isinstance(value, Vector) and len(value) == 3:
+        return TRACERParamType.VECTOR3.value
+    elif isinstance(value, Vector) and len(value) == 4:
+        return TRACERParamType.VECTOR4.value
+    elif isinstance(value, Quaternion):
+        return TRACERParamType.QUATERNION.value
+    elif isinstance(value, Color):
+        return TRACERParamType.COLOR.value
+    elif isinstance(value, str):
+        return TRACERParamType.STRING.value
+    else:
+        return TRACERParamType.UNKNOWN.value
+
+# numpy types of the struct fields used by the codecs
+FIELD_DTYPES = {'?': '?', 'i': '<i4', 'f': '<f4'}
+
+## Encoder/decoder of the values of one TRACER parameter type (little endian, fixed size)
+#  A codec is bound once to each parameter, so (de)serializing does not inspect the value again.
+#  @param layout        struct format of the serialized value
+#  @param to_fields     value -> tuple of the struct fields
+#  @param from_fields   tuple of the struct fields -> value
+class ParameterCodec:
+    def __init__(self, param_type: TRACERParamType, layout: str, to_fields, from_fields):
+        self.type = param_type.value
+        self.layout = struct.Struct(layout)
+        self.size = self.layout.size
+        self.to_fields = to_fields
+        self.from_fields = from_fields
+        # numpy layout of a serialized value and of a serialized key, for decoding whole key blocks
+        field = layout[-1]
+        value_dtype = (FIELD_DTYPES[field], (self.size // struct.calcsize('<' + field),))
+        self.key_dtype = np.dtype([('type', 'u1'), ('time', '<f4'), ('right_tangent_time', '<f4'), ('left_tangent_time', '<f4'),
+                                   ('value', value_dtype), ('right_tangent_value', value_dtype), ('left_tangent_value', value_dtype)])
+
+    ## Size in bytes of a serialized value
+    def data_size(self, value) -> int:
+        return self.size
+
+    def encode(self, value) -> bytes:
+        return self.layout.pack(*self.to_fields(value))
+
+    def encode_into(self, buffer: bytearray, offset: int, value) -> None:
+        self.layout.pack_into(buffer, offset, *self.to_fields(value))
+
+    def decode(self, buffer, offset: int = 0):
+        return self.from_fields(self.layout.unpack_from(buffer, offset))
+
+## Strings have no fixed size, they are sent as their ascii bytes
+class StringCodec(ParameterCodec):
+    def __init__(self):
+        self.type = TRACERParamType.STRING.value
+        self.size = 0
+        self.key_dtype = None
+
+    def data_size(self, value) -> int:
+        return len(value)
+
+    def encode(self, value) -> bytes:
+        return value.encode(encoding='ascii', errors='strict')
+
+    def encode_into(self, buffer: bytearray, offset: int, value) -> None:
+        data = self.encode(value)
+        buffer[offset : offset+len(data)] = data
+
+    ## Decodes the whole buffer after offset
+    def decode(self, buffer, offset: int = 0):
+        # https://docs.python.org/3/library/stdtypes.html#bytearray.decode
+        return bytes(buffer[offset:]).decode(encoding='ascii', errors='strict')
+
+#? Vectors are sent as they are, the Y-Z swap for unity's handidness is done by the receiver
+PARAMETER_CODECS: dict[int, ParameterCodec] = {codec.type: codec for codec in (
+    ParameterCodec(TRACERParamType.BOOL,       '<?',  lambda v: (v,),                   lambda f: f[0]),
+    #? Signed or unsigned Integer?
+    ParameterCodec(TRACERParamType.INT,        '<i',  lambda v: (int(v),),              lambda f: f[0]),
+    ParameterCodec(TRACERParamType.FLOAT,      '<f',  lambda v: (float(v),),            lambda f: f[0]),
+    ParameterCodec(TRACERParamType.VECTOR2,    '<2f', lambda v: (v.x, v.y),             lambda f: Vector(f)),
+    ParameterCodec(TRACERParamType.VECTOR3,    '<3f', lambda v: (v.x, v.y, v.z),        lambda f: Vector(f)),
+    ParameterCodec(TRACERParamType.VECTOR4,    '<4f', lambda v: (v.x, v.y, v.z, v.w),   lambda f: Vector(f).wxyz),
+    # The quaternion is passed in the order XYZW
+    ParameterCodec(TRACERParamType.QUATERNION, '<4f', lambda v: (v.x, v.y, v.z, v.w),   lambda f: Quaternion((f[3], f[0], f[1], f[2]))),
+    #! Color in mathutils is only RGB
+    ParameterCodec(TRACERParamType.COLOR,      '<4f', lambda v: (v.r, v.b, v.g, 1.0),   lambda f: Color(f[:3])),
+    StringCodec(),
+)}
+
+# Serialized key: key type, time, left tangent time, right tangent time, followed by value, left and right tangent value
+KEY_HEADER = struct.Struct('<Bfff')
+KEY_COUNT = struct.Struct('<H')
+
 ## Abstract Class AbstractParameter (necessary to declare copy method in the AbstractParameter class)
 class AbstractParameter:
     pass
@@ -93,27 +194,6 @@ class Key:
         self.right_tangent_value = right_tangent_value if right_tangent_value != None else value
         self.left_tangent_value = left_tangent_value if left_tangent_value != None else value
 
-    def __sizeof__(self) -> int:
-        return self.get_key_size()
-
-    def get_data_size(self):
-        if isinstance(self.value, bool):
-            return struct.calcsize('?') # = 1
-        elif isinstance(self.value, int) or isinstance(self.value, float):
-            return struct.calcsize('i') # = 4
-        elif isinstance(self.value, Vector) and len(self.value) == 2:
-            return struct.calcsize('f') * 2 # = 8
-        elif isinstance(self.value, Vector) and len(self.value) == 3:
-            return struct.calcsize('f') * 3 # = 12
-        elif isinstance(self.value, Vector) and len(self.value) == 4 or isinstance(self.value, Quaternion) or isinstance(self.value, Color):
-            return struct.calcsize('f') * 4 # = 16
-        elif isinstance(self.value, str):
-            return struct.calcsize('c') * len(self.value) # len_of_string * size_of_char
-
-    def get_key_size(self):
-        # byte (key_type) +           float (time) +           float (tangent_time) +   size_of_param (value) +    size_of_param (tangentvalue)
-        return          1 + self.time.__sizeof__() + self.right_tangent_time.__sizeof__() + self.value.__sizeof__() + self.right_tangent_value.__sizeof__() # TODO: Add left tangent
-    
     def is_equal(self, other):
         return (self.key_type               == other.key_type               and\
                 self.time                   == other.time                   and\
@@ -123,68 +203,195 @@ class Key:
                 self.right_tangent_value    == other.right_tangent_value    and\
                 self.left_tangent_value     == other.left_tangent_value     )
     
+## Keys of an animated parameter, stored as parallel numpy columns sorted by time
+#  The columns hold the values in their serialized layout (see ParameterCodec.key_dtype):
+#  type, time, right_tangent_time, left_tangent_time, value, right_tangent_value, left_tangent_value.
+#  Key objects are only created on request (get_key, get_list).
 class KeyList:
-    __data: list[Key]
+    __columns: dict[str, np.ndarray]
     has_changed: bool
-
-    def __init__(self) -> None:
-        self.__data = []
+    changed_range: tuple[float, float]  # first and last time of the keys changed since reset_changes, None if none changed
+
+    ## @param codec     Codec of the animated parameter, it defines the layout of the value columns
+    def __init__(self, codec: ParameterCodec = None) -> None:
+        self.__codec = codec
+        self.__columns = self.__split(self.__empty())
+        # Key objects built from the columns, dropped on every change
+        self.__keys: list[Key] = None
         self.has_changed = False
+        self.changed_range = None
 
     def __len__(self) -> int:
-        return len(self.__data)
+        return len(self.__columns['time'])
 
     def clear(self) -> None:
-        self.__data.clear()
+        self.__columns = self.__split(self.__empty())
+        self.__keys = None
+
+    ## Forget the changes recorded so far (has_changed, changed_range)
+    def reset_changes(self) -> None:
+        self.has_changed = False
+        self.changed_range = None
 
     def size(self) -> int:
-        return len(self.__data)
+        return len(self)
     
     def get_key(self, index: int) -> Key:
         if index < len(self):
-            return self.__data[index]
+            return self.get_list()[index]
         else:
             raise LookupError("Key not found in Parameter Key List")
     
+    ## Replace the key at index (append if index is the size of the list or -1)
+    #  If the new time breaks the order of the keys, the list is sorted again.
     def set_key(self, key: Key, index: int):
         if index > self.size():
             raise IndexError("Setting Key Out Of Bounds for KeyList")
         elif index == self.size() or index == -1:
-            self.__data.append(key)
-            self.has_changed = True
+            self.add_key(key)
         else:
-            if not key.is_equal(self.__data[index]):
-                self.__data[index] = key
-                self.has_changed = True
-
+            row = self.__row(key)
+            if not all(np.array_equal(self.__columns[name][index], row[name][0]) for name in self.__columns):
+                old_time = self.__columns['time'][index]
+                for name, column in self.__columns.items():
+                    column[index] = row[name][0]
+                times = self.__columns['time']
+                if (index > 0 and times[index-1] > times[index]) or (index < len(times)-1 and times[index] > times[index+1]):
+                    order = np.argsort(times, kind='stable')
+                    self.__columns = {name: column[order] for name, column in self.__columns.items()}
+                self.__changed(old_time, key.time)
+
+    ## Insert a key at its time (after existing keys with the same time)
     def add_key(self, key: Key):
-        self.__data.append(key)
-        self.has_changed = True
+        index = int(np.searchsorted(self.__columns['time'], key.time, side='right'))
+        row = self.__row(key)
+        self.__columns = {name: np.insert(column, index, row[name], axis=0) for name, column in self.__columns.items()}
+        self.__changed(key.time)
 
+    ## Remove the (first) key with the time of the given key
     def remove_key(self, key: Key) -> Key:
-        flagged_index = -1
-        for k, i in enumerate(self.__data):
-            # Look for the key to be removed based on its timestamp
-            # Stop updating the index at the first found instance 
-            if k.time == key.time and flagged_index < 0:
-                flagged_index = i
-
-        if flagged_index > 0:
-            return self.remove_key_at_index(flagged_index)
-        else:
+        index = self.find(key.time)
+        if index < 0:
             raise LookupError("Key not found in Parameter Key List")
+        return self.remove_key_at_index(index)
                 
     def remove_key_at_index(self, index: int) -> Key:
-        if index < len(self):
-            removed_key = self.__data[index]
-            self.__data.remove(index)
-            self.has_changed = True
+        if 0 <= index < len(self):
+            removed_key = self.get_list()[index]
+            self.__columns = {name: np.delete(column, index, axis=0) for name, column in self.__columns.items()}
+            self.__changed(removed_key.time)
             return removed_key
         else:
             raise LookupError("Key not found in Parameter Key List")
     
+    ## Key objects of the list, created from the columns on first request
     def get_list(self) -> list[Key]:
-        return self.__data
+        if self.__keys == None:
+            c = self.__columns
+            decode = self.__codec.from_fields
+            self.__keys = [Key(time = t, value = decode(v), type = KeyType(k),
+                               right_tangent_time = rt, right_tangent_value = decode(rv),
+                               left_tangent_time  = lt, left_tangent_value  = decode(lv))
+                           for k, t, rt, lt, v, rv, lv in zip(c['type'].tolist(), c['time'].tolist(),
+                                                              c['right_tangent_time'].tolist(), c['left_tangent_time'].tolist(),
+                                                              c['value'].tolist(), c['right_tangent_value'].tolist(), c['left_tangent_value'].tolist())]
+        return self.__keys
+
+    ## Add the keys of a decoded key block, replacing the current keys at the same times
+    #  @param columns   One array per field of ParameterCodec.key_dtype, one row per key
+    def merge_columns(self, columns: dict[str, np.ndarray]) -> None:
+        keep = ~np.isin(self.__columns['time'], columns['time'])
+        self.set_columns({name: np.concatenate((column[keep], columns[name])) for name, column in self.__columns.items()})
+
+    ## Replace all keys with a decoded key block
+    #  Only the keys that differ from the current ones are recorded as changed: the keys between
+    #  the first and the last key that are not the same in the old and in the new columns.
+    #  @param columns   One array per field of ParameterCodec.key_dtype, one row per key
+    def set_columns(self, columns: dict[str, np.ndarray]) -> None:
+        times = columns['time']
+        if len(times) > 1 and np.any(times[1:] < times[:-1]):
+            order = np.argsort(times, kind='stable')
+            columns = {name: column[order] for name, column in columns.items()}
+
+        old_columns = self.__columns
+        n_old, n_new = len(old_columns['time']), len(columns['time'])
+        n = min(n_old, n_new)
+        # length of the common head and tail of the old and new keys
+        head = self.__equal_rows(old_columns, columns, slice(0, n), slice(0, n))
+        same_head = n if head.all() else int(np.argmin(head))
+        tail = self.__equal_rows(old_columns, columns, slice(n_old - n, n_old), slice(n_new - n, n_new))
+        same_tail = n if tail.all() else n - 1 - int(np.flatnonzero(~tail)[-1])
+        same_tail = min(same_tail, n - same_head)
+        changed_times = np.concatenate((old_columns['time'][same_head:n_old - same_tail], columns['time'][same_head:n_new - same_tail]))
+
+        self.__columns = columns
+        self.__keys = None
+        if len(changed_times) > 0:
+            self.__changed(changed_times.min(), changed_times.max())
+
+    ## The keys as one array per field (see set_columns), the arrays must not be modified
+    def get_columns(self) -> dict[str, np.ndarray]:
+        return self.__columns
+
+    def get_times(self) -> np.ndarray:
+        return self.__columns['time']
+
+    ## Index of the (first) key at time, -1 if there is none
+    def find(self, time: float) -> int:
+        times = self.__columns['time']
+        index = int(np.searchsorted(times, time, side='left'))
+        if index < len(times) and times[index] == np.float32(time):
+            return index
+        return -1
+
+    ## Indices of the last key at or before time and of the first key after time (-1 if there is none)
+    def get_neighbours(self, time: float) -> tuple[int, int]:
+        index = int(np.searchsorted(self.__columns['time'], time, side='right'))
+        return index - 1, index if index < len(self) else -1
+
+    ## Index range of the keys with start_time <= time <= end_time
+    def get_range(self, start_time: float, end_time: float) -> slice:
+        times = self.__columns['time']
+        return slice(int(np.searchsorted(times, start_time, side='left')), int(np.searchsorted(times, end_time, side='right')))
+
+    ## Columns of the keys in an index range (views, see get_range)
+    def get_range_columns(self, key_range: slice) -> dict[str, np.ndarray]:
+        return {name: column[key_range] for name, column in self.__columns.items()}
+
+    ## Drop the Key objects and add the times to the changed range
+    def __changed(self, *times: float):
+        self.__keys = None
+        self.has_changed = True
+        start, end = float(min(times)), float(max(times))
+        if self.changed_range != None:
+            start, end = min(start, self.changed_range[0]), max(end, self.changed_range[1])
+        self.changed_range = (start, end)
+
+    ## For every row of the ranges, whether the old and the new row are the same in all columns
+    @staticmethod
+    def __equal_rows(old_columns: dict[str, np.ndarray], new_columns: dict[str, np.ndarray], old_rows: slice, new_rows: slice) -> np.ndarray:
+        equal = np.ones(old_rows.stop - old_rows.start, dtype=bool)
+        if len(equal) == 0:
+            return equal
+        for name, column in new_columns.items():
+            equal &= (column[new_rows] == old_columns[name][old_rows]).reshape(len(equal), -1).all(axis=1)
+        return equal
+
+    def __empty(self) -> np.ndarray:
+        if self.__codec == None or self.__codec.key_dtype == None:
+            return np.zeros(0, dtype=[('type', 'u1'), ('time', '<f4'), ('right_tangent_time', '<f4'), ('left_tangent_time', '<f4')])
+        return np.zeros(0, dtype=self.__codec.key_dtype)
+
+    def __split(self, block: np.ndarray) -> dict[str, np.ndarray]:
+        return {name: np.ascontiguousarray(block[name]) for name in block.dtype.names}
+
+    def __row(self, key: Key) -> np.ndarray:
+        if self.__codec == None or self.__codec.key_dtype == None:
+            raise TypeError("Parameters of this type can not be animated")
+        to_fields = self.__codec.to_fields
+        return np.array([(KeyType(key.key_type).value, key.time, key.right_tangent_time, key.left_tangent_time,
+                          to_fields(key.value), to_fields(key.right_tangent_value), to_fields(key.left_tangent_value))],
+                        dtype=self.__codec.key_dtype)
 
 class AbstractParameter:
 
@@ -196,8 +403,10 @@ class AbstractParameter:
         
         # Parameter value - type of the value depends on the parameter that is being keyed
         self.value: bool | int | float | Vector | Quaternion | Color | str | list = value   #? type Action?
-        # Type of the Parameter according to Tracer' definition (private)
-        self.__type: TRACERParamType = self.get_tracer_type()
+        # Type of the Parameter according to Tracer' definition (private), resolved once
+        self.__type: int = tracer_type_of(value)
+        # Encoder/decoder of the values of the parameter (None if the type is unknown)
+        self.codec: ParameterCodec = PARAMETER_CODECS.get(self.__type)
         # Paramter ID (private)
         self.__id: int = -1
         if parent_object:
@@ -230,42 +439,13 @@ class AbstractParameter:
     def get_parameter_id(self):
         return self.__id
 
-    def get_tracer_type(self):
-        if isinstance(self.value, bool):
-            return TRACERParamType.BOOL.value
-        elif isinstance(self.value, int):
-            return TRACERParamType.INT.value
-        elif isinstance(self.value, float):
-            return TRACERParamType.FLOAT.value
-        elif isinstance(self.value, Vector) and len(self.value) == 2:
-            return TRACERParamType.VECTOR2.value
-        elif isinstance(self.value, Vector) and len(self.value) == 3:
-            return TRACERParamType.VECTOR3.value
-        elif isinstance(self.value, Vector) and len(self.value) == 4:
-            return TRACERParamType.VECTOR4.value
-        elif isinstance(self.value, Quaternion):
-            return TRACERParamType.QUATERNION.value
-        elif isinstance(self.value, Color):
-            return TRACERParamType.COLOR.value
-        elif isinstance(self.value, str):
-            return TRACERParamType.STRING.value
-        else:
-            return TRACERParamType.UNKNOWN.value
+    def get_tracer_type(self) -> int:
+        return self.__type
     
     def get_data_size(self) -> int:
-        match self.__type:
-            case TRACERParamType.BOOL.value:
-                return struct.calcsize('?') # = 1
-            case TRACERParamType.INT.value | TRACERParamType.FLOAT.value:
-                return struct.calcsize('i') # = 4
-            case TRACERParamType.VECTOR2.value:
-                return struct.calcsize('f') * 2 # = 8
-            case TRACERParamType.VECTOR3.value:
-                return struct.calcsize('f') * 3 # = 12
-            case TRACERParamType.VECTOR4.value | TRACERParamType.QUATERNION.value | TRACERParamType.COLOR.value:
-                return struct.calcsize('f') * 4 # = 16
-            case TRACERParamType.STRING:
-                return struct.calcsize('c') * len(self._value) # len_of_string * size_of_char
+        if self.codec == None:
+            return 0
+        return self.codec.data_size(self.value)
         
     def python_type(self):
         return type(self._value)
@@ -284,7 +464,7 @@ class Parameter(AbstractParameter):
 
     def __init__(self, value, name, parent_object = None, distribute = True, is_RPC = False, is_animated = False):
         super().__init__(value, name, parent_object, distribute, is_RPC, is_animated)
-        self.key_list = KeyList()
+        self.key_list = KeyList(self.codec)
 
     # resets value to initial value, why do we want to do that?
     def reset(self):
@@ -300,6 +480,10 @@ class Parameter(AbstractParameter):
         self.key_list.clear()
         self.parent_object.armature_obj_pose_bones[self.parent_object.name].animation_data_clear()
 
+    ## Value of the animated parameter at time, see keyEvaluation for the interpolation
+    def evaluate(self, time: float):
+        return self.codec.from_fields(evaluate_parameter(self, [time])[0].tolist())
+
     def get_key_list(self) -> list[Key]:
         return self.key_list.get_list()
 
@@ -310,8 +494,8 @@ class Parameter(AbstractParameter):
         data_size = self.get_data_size()
         if self.is_animated:
             # When animated, the size of the parameter increases. After the first payload, there will be the number of keys that the animated parameter will have and then the list of those keys. 
-            #         size_of_param +  size_of_short (nr_keys) +             nr_keys *                      size_of_key (= 2* size_of_param (value + tangent_value) + 2 * size_of_float (time + tangent_time) + byte (key_type))
-            return        data_size +                        2 + len(self.key_list) * self.get_key(0).get_key_size()
+            #         size_of_param +  size_of_short (nr_keys) +             nr_keys * size_of_key (= byte (key_type) + 3 * size_of_float (time + tangent times) + 3 * size_of_param (value + tangent values))
+            return        data_size +          KEY_COUNT.size + len(self.key_list) * (KEY_HEADER.size + 3 * data_size)
         else:
             return data_size
 
@@ -354,114 +538,47 @@ class Parameter(AbstractParameter):
     #######################
 
     def serialize(self) -> bytearray:
-        payload = bytearray([])
-        payload.extend(self.serialize_data(self.value))
+        codec = self.codec
+        data_size = self.get_data_size()
+        payload = bytearray(self.get_size())
+        codec.encode_into(payload, 0, self.value)
         if self.is_animated:
-            payload.extend(struct.pack('<H', len(self.key_list)))
+            offset = data_size
+            KEY_COUNT.pack_into(payload, offset, len(self.key_list))
+            offset += KEY_COUNT.size
             for key in self.key_list.get_list():
-                key_payload = bytearray([])
-                key_payload.extend(struct.pack(' B', key.key_type.value))   #  'B' represents the format of an unsigned char (1 byte) encoded as little endian
-                key_payload.extend(struct.pack('<f', key.time))             # '<f' represents the format of a signed float (4 bytes) encoded as little endian
-                key_payload.extend(struct.pack('<f', key.left_tangent_time))
-                key_payload.extend(struct.pack('<f', key.right_tangent_time))
-                key_payload.extend(self.serialize_data(key.value))
-                key_payload.extend(self.serialize_data(key.left_tangent_value))
-                key_payload.extend(self.serialize_data(key.right_tangent_value))
-                payload.extend(key_payload)
+                KEY_HEADER.pack_into(payload, offset, key.key_type.value, key.time, key.left_tangent_time, key.right_tangent_time)
+                offset += KEY_HEADER.size
+                codec.encode_into(payload, offset, key.value)
+                codec.encode_into(payload, offset + data_size, key.left_tangent_value)
+                codec.encode_into(payload, offset + 2*data_size, key.right_tangent_value)
+                offset += 3 * data_size
         return payload
 
-    def serialize_data(self, value = None) -> bytearray:
+    def serialize_data(self, value = None) -> bytes:
         # If the attribute value is not initialised, the internal self.value instance attribute is going to be serialised
-        #? Vectors are swizzled (Y-Z swap) in order to comply with the different handidness between blender and unity
-        #? Quanternion rotation is taken from the object's rotation and swizzled (from XYZW to WXYZ)
         if value == None:
-            match self.get_tracer_type():
-                case TRACERParamType.VECTOR3.value:
-                    value = self.value
-                case TRACERParamType.VECTOR4.value:
-                    value = self.value
-                case TRACERParamType.QUATERNION.value:
-                    self.parent_object.blender_object.rotation_mode = 'QUATERNION'
-                    quat: Quaternion = self.value
-                    value = Quaternion((quat.w, quat.x, quat.y, quat.z))
-                    self.parent_object.blender_object.rotation_mode = 'XYZ'
-                case _:
-                    value = self.value
-
-        match self.get_tracer_type():
-            case TRACERParamType.BOOL.value:
-                return struct.pack('?', value)
-            case TRACERParamType.INT.value:
-                return struct.pack('<i', value)
-            case TRACERParamType.FLOAT.value:
-                return struct.pack('<f', value)
-            case TRACERParamType.VECTOR2.value:
-                return struct.pack('<2f', value.x, value.y)
-            case TRACERParamType.VECTOR3.value:
-                unity_vec3 = value.xzy
-                return struct.pack('<3f', value.x, value.y, value.z)
-            case TRACERParamType.VECTOR4.value:
-                unity_vec4 = value.xzyw
-                return struct.pack('<4f', value.x, value.y, value.z, value.w)
-            case TRACERParamType.QUATERNION.value:
-                return struct.pack('<4f', value.x, value.y, value.z, value.w)
-            case TRACERParamType.COLOR.value:
-                #! Color in mathutils is only RGB
-                return struct.pack('<4f', value.r, value.b, value.g, 1)
-            case TRACERParamType.STRING.value:
-                string_length = str(len(value))
-                format_string = string_length + "s"
-                return struct.pack(format_string, value)
+            value = self.value
+        return self.codec.encode(value)
         
     #######################
     ##  Deserialization  ##
     #######################
 
-    def deserialize(self, msg_payload: bytearray) -> None:
+    ## @param merge_keys  Add the received keys to the current ones (and keep the recorded changes of the key list)
+    #                      instead of replacing them, for further key blocks received in the same tick
+    def deserialize(self, msg_payload: bytearray, merge_keys: bool = False) -> None:
         data_size = self.get_data_size()
         msg_size  = len(msg_payload)
         value_bytes = msg_payload[0:data_size]
         self.set_value(self.deserialize_data(value_bytes))
 
-        if self.is_animated:
-            # Reset has_changed flag before deserializing the keyframes
-            self.key_list.has_changed = False
+        if self.is_animated and not merge_keys:
+            # Reset the has_changed flag and the changed key range before deserializing the keyframes
+            self.key_list.reset_changes()
 
         if self.is_animated and msg_size > data_size:
-            self.key_list.clear()
-
-            byte_count = data_size
-            msg_n_keys = msg_payload[byte_count:byte_count+2]
-            n_keys = struct.unpack('<H', msg_n_keys)[0]
-            byte_count += 2
-            key_count = 0
-            while key_count < n_keys:
-                # Read Key Type
-                key_type = struct.unpack('B', msg_payload[byte_count:byte_count+1])[0]
-                byte_count += 1
-                # Read Key Timestamp
-                time = struct.unpack('<f', msg_payload[byte_count:byte_count+4])[0]
-                byte_count += 4
-                # Read Key Tangent Times
-                right_tangent_time = struct.unpack('<f', msg_payload[byte_count:byte_count+4])[0]
-                byte_count += 4
-                left_tangent_time = struct.unpack('<f', msg_payload[byte_count:byte_count+4])[0]
-                byte_count += 4
-                # Read Key Value
-                value = self.deserialize_data(msg_payload[byte_count:byte_count+data_size])
-                byte_count += data_size
-                # Read Key Tangent Values
-                right_tangent_value = self.deserialize_data(msg_payload[byte_count:byte_count+data_size])
-                byte_count += data_size
-                left_tangent_value = self.deserialize_data(msg_payload[byte_count:byte_count+data_size])
-                byte_count += data_size
-                
-                deserialized_key = Key(time = time, value = value, type = key_type,
-                                       right_tangent_time = right_tangent_time, right_tangent_value = right_tangent_value,
-                                       left_tangent_time  = left_tangent_time,  left_tangent_value  = left_tangent_value )
-                self.key_list.set_key(deserialized_key, key_count)
-                
-                key_count += 1
+            self.deserialize_keys(msg_payload, data_size, merge_keys)
             
             bpy.context.window.modal_operators[-1].report({'INFO'}, "New Animation Received!")
         
@@ -471,48 +588,22 @@ class Parameter(AbstractParameter):
             self.emit_has_changed()
             self.parent_object.network_lock = False
 
+    ## Decode the key block (number of keys followed by the keys) in one pass into the columns of the key list
+    #  No Key objects are created here, see KeyList.get_list
+    #  @param merge   Add the keys to the key list instead of replacing its keys, see KeyList.merge_columns
+    def deserialize_keys(self, msg_payload: bytearray, start: int, merge: bool = False) -> None:
+        codec = self.codec
+        n_keys = KEY_COUNT.unpack_from(msg_payload, start)[0]
+        block = np.frombuffer(msg_payload, dtype=codec.key_dtype, count=n_keys, offset=start+KEY_COUNT.size)
+        # copy the fields out of the message, so that the message buffer can be released
+        columns = {name: np.ascontiguousarray(block[name]) for name in codec.key_dtype.names}
+        if merge:
+            self.key_list.merge_columns(columns)
+        else:
+            self.key_list.set_columns(columns)
+
     def deserialize_data(self, msg_payload: bytearray):
-        match self.get_tracer_type():
-            case TRACERParamType.BOOL.value:
-                bool_val = struct.unpack('?', msg_payload)[0]
-                return bool_val
-
-            case TRACERParamType.INT.value:
-                #? Signed or unsigned Integer?
-                int_val = struct.unpack('<i', msg_payload)[0]
-                return int_val
-
-            case TRACERParamType.FLOAT.value:
-                float_val = struct.unpack('<f', msg_payload)[0]
-                return float_val
-
-            case TRACERParamType.VECTOR2.value:
-                vec2_val = Vector((struct.unpack('<2f', msg_payload)))
-                return vec2_val
-
-            case TRACERParamType.VECTOR3.value:
-                vec3_val = Vector((struct.unpack('<3f', msg_payload)))
-                # Swap Y and Z axis to adapt to blender's handidness
-                return vec3_val.xyz
-
-            case TRACERParamType.VECTOR4.value:
-                vec3_val = Vector((struct.unpack('<4f', msg_payload)))
-                # Swap Y and Z axis to adapt to blender's handidness
-                return vec3_val.wxyz
-
-            case TRACERParamType.QUATERNION.value:
-                # The quaternion is passed in the order XYZW
-                quat_val = Quaternion((struct.unpack('<4f', msg_payload)))
-                return Quaternion((quat_val[3], quat_val[0], quat_val[1], quat_val[2]))
-
-            case TRACERParamType.COLOR.value:
-                color_val = Color((struct.unpack('<4f', msg_payload)))
-                return color_val
-
-            case TRACERParamType.STRING.value:
-                # https://docs.python.org/3/library/stdtypes.html#bytearray.decode
-                string_val = msg_payload.decode(encoding='ascii', errors='strict')
-                return string_val
-
-            case _:
-                print("Unknown type")
+        if self.codec == None:
+            print("Unknown type")
+            return None
+        return self.codec.decode(msg_payload)
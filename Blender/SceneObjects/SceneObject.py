@@ -149,6 +149,11 @@ class SceneObject:
         # Update the initial_value to the latest value
         tracer_scl.initial_value = new_value
 
+    ### Function applying the parameter updates that were collected during a network tick instead of being applied one by one
+    #   Called once per tick for every Scene Object that received parameter updates (see SceneObjectCharacter)
+    def apply_pending_updates(self):
+        pass
+
     ### Function that toggles the network_lock of Scene Objects
     #   @param  lock_val    value of the network_lock to be set
     def lock_unlock(self, lock_val: int):
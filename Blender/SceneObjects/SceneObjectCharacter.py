@@ -38,11 +38,27 @@ import math
 from mathutils import Matrix, Quaternion, Vector, Euler
 import copy
 import bpy
+import numpy as np
 
 from ..settings import TracerProperties
-from ..AbstractParameter import Parameter, KeyList, Key, KeyType
+from ..AbstractParameter import Parameter, KeyList, Key, KeyType, AnimHostRPC
 from .SceneObject import SceneObject, NodeTypes
 from ..serverAdapter import send_parameter_update
+from ..animationBake import write_fcurves, splice_fcurves
+from ..poseSolver import PoseSolver, decompose
+from ..poseStream import PoseStream
+from ..keyEvaluation import evaluate_parameter
+
+### Values of an animated parameter at the given frames, in the layout of its key columns
+#   The key values are used directly if there is a key exactly at every frame
+def sample_keys(parameter: Parameter, frames: np.ndarray) -> np.ndarray:
+    columns = parameter.key_list.get_columns()
+    if np.array_equal(columns['time'], frames):
+        return columns['value']
+    indices = np.searchsorted(columns['time'], frames)
+    if np.all(indices < len(columns['time'])) and np.array_equal(columns['time'][np.minimum(indices, len(columns['time']) - 1)], frames):
+        return columns['value'][indices]
+    return evaluate_parameter(parameter, frames)
 
 ### Operator to show to the user that a new animation has been received
 class ReportReceivedAnimation(bpy.types.Operator):
@@ -74,6 +90,12 @@ class SceneObjectCharacter(SceneObject):
         self.local_bone_rest_transform: dict[str, Matrix] = {}                                                  # Stores the local resting bone space transformations in a dictionary (bone name - rest transfrorm matrix)
         self.local_rotation_map:        dict[str, Matrix] = {}                                                  # Stores the rotation transforms updated by TRACER in local bone space in a dictionary (bone name - rotation matrix) (may cause issues with values updated in a TRACER non-compliant way)
         self.local_translation_map:     dict[str, Matrix] = {}                                                  # Stores the positional transforms updated by TRACER in local bone space in a dictionary (bone name - translation matrix)
+        self.pose_solver: PoseSolver = None                                                                     # Batched forward kinematics of the armature (see get_pose_solver)
+        self.pending_rotations:         dict[str, Quaternion] = {}                                              # Bone rotations received in the current tick, applied by apply_pending_updates (bone name - quaternion)
+        self.pending_positions:         set[str] = set()                                                        # Bones whose position was received in the current tick
+        self.stream_mode: AnimHostRPC = AnimHostRPC.BLOCK                                                       # How the animations from AnimHost are received (see set_stream_mode)
+        self.pose_stream: PoseStream = None                                                                     # The last frames of the current AnimHost stream (see stream_animation)
+        self.baked_frames: np.ndarray = None                                                                    # Frames of the action written by the last bake with the pose solver (see rebake_animation)
 
         # Saving initial/resting armature bone transforms in local **bone** space
         # Necessary for then applying animation displacements in the correct transform space
@@ -120,8 +142,9 @@ class SceneObjectCharacter(SceneObject):
         if path_ID >= 0:
             self.parameter_list.append(Parameter(value=path_ID, name=bl_obj.name+"-control_path", parent_object=self))
 
-    ### Function that uses the partial transformation matrices to set the bone position and rotations in pose coordinates (as Blender needs)
-    def set_pose_matrices(self, pose_bone_obj: bpy.types.PoseBone):
+    ### Function that uses the partial transformation matrices to compute the bone position and rotations in pose coordinates (as Blender needs)
+    #   @returns    The new matrix_basis of the bone, None if no rotation has been received for the bone yet
+    def get_pose_matrix(self, pose_bone_obj: bpy.types.PoseBone) -> Matrix:
         pose_bone: bpy.types.Bone
         if pose_bone_obj.name in self.local_rotation_map:
             rotation_matrix = self.local_rotation_map[pose_bone_obj.name]
@@ -133,34 +156,60 @@ class SceneObjectCharacter(SceneObject):
 
             # Composing translation and rotation matrices
             new_matrix: Matrix = translation_matrix @ rotation_matrix
-            # Assigning the correct local transformation matrix to the Pose Bone Object (given the parent transform, if there is one), using convert_local_to_pose
+            # The correct local transformation matrix of the Pose Bone Object (given the parent transform, if there is one), using convert_local_to_pose
             if pose_bone_obj.parent:
                 parent_rotation_matrix = self.local_rotation_map[pose_bone_obj.parent.name]
-                pose_bone_obj.matrix_basis = pose_bone.convert_local_to_pose( new_matrix, pose_bone.matrix_local,
-                                                                              parent_matrix = parent_rotation_matrix,
-                                                                              parent_matrix_local = pose_bone.parent.matrix_local,
-                                                                              invert=True )
+                return pose_bone.convert_local_to_pose( new_matrix, pose_bone.matrix_local,
+                                                        parent_matrix = parent_rotation_matrix,
+                                                        parent_matrix_local = pose_bone.parent.matrix_local,
+                                                        invert=True )
             else:
-                pose_bone_obj.matrix_basis = pose_bone.convert_local_to_pose( new_matrix, pose_bone.matrix_local, invert=True )
+                return pose_bone.convert_local_to_pose( new_matrix, pose_bone.matrix_local, invert=True )
+        return None
+
+    ### Function that uses the partial transformation matrices to set the bone position and rotations in pose coordinates (as Blender needs)
+    def set_pose_matrices(self, pose_bone_obj: bpy.types.PoseBone):
+        matrix = self.get_pose_matrix(pose_bone_obj)
+        if matrix != None:
+            pose_bone_obj.matrix_basis = matrix
 
-    ### Function that takes the new rotaional offset -w.r.t. the rest transform- as a quaternion and translates it into a 4x4 matrix
-    #   that expresses the bone rotation relative to the parent and own rest bone -to be used as the new matrix_basis-
+    ### Function that records the new rotaional offset -w.r.t. the rest transform- of a bone as a quaternion
+    #   The pose is updated once per tick with all the bone updates received in it, see apply_pending_updates
     def update_bone_rotation(self, tracer_rot: Parameter, new_quat: Quaternion):
         bone_name = tracer_rot.name.partition("-")[0] # Extracting the name of the bone from the name of the parameter -e.g: spine_1-rotation_quat -> hip-
-        target_bone: bpy.types.PoseBone = self.armature_obj_pose_bones[bone_name]
-        local_rest_transform: Matrix = self.local_bone_rest_transform[bone_name]
-        
+        self.pending_rotations[bone_name] = new_quat
+
+    ### Function that translates the rotaional offset of a bone into a 4x4 matrix that expresses the bone rotation
+    #   relative to the parent and own rest bone -to be used for the new matrix_basis-
+    def compute_rotation_matrix(self, target_bone: bpy.types.PoseBone, new_quat: Quaternion) -> Matrix:
+        local_rest_transform: Matrix = self.local_bone_rest_transform[target_bone.name]
         # Initialize the local parent rotation matrix -4x4 identity matrix, if the target bone has no parent bone-
         parent_rotation = self.local_rotation_map[target_bone.parent.name] if target_bone.parent else Matrix.Identity(4)
-        new_rotation_matrix =   parent_rotation @\
-                                Matrix.Translation(local_rest_transform.to_translation()) @\
-                                new_quat.to_matrix().to_4x4()
-        # Set the new transform, given by the new quaternion value, as the local rotation for the current target_bone
-        self.local_rotation_map[bone_name] = new_rotation_matrix
-        self.set_pose_matrices(target_bone)
-    
+        return  parent_rotation @\
+                Matrix.Translation(local_rest_transform.to_translation()) @\
+                new_quat.to_matrix().to_4x4()
+
+    ### Applying all the bone rotations and positions received in the current tick at once
+    #   The bones are visited in hierarchy order (parents first), so every bone is computed with the new rotation
+    #   of its parent whatever the order of the records in the messages, and every bone is posed only once per tick.
+    def apply_pending_updates(self):
+        if len(self.pending_rotations) == 0 and len(self.pending_positions) == 0:
+            return
+
+        for bone_name in self.get_pose_solver().bone_names:
+            new_quat = self.pending_rotations.get(bone_name)
+            if new_quat != None:
+                target_bone: bpy.types.PoseBone = self.armature_obj_pose_bones[bone_name]
+                # Set the new transform, given by the new quaternion value, as the local rotation for the current target_bone
+                self.local_rotation_map[bone_name] = self.compute_rotation_matrix(target_bone, new_quat)
+                self.set_pose_matrices(target_bone)
+            elif bone_name in self.pending_positions:
+                self.set_pose_matrices(self.armature_obj_pose_bones[bone_name])
+        self.pending_rotations.clear()
+        self.pending_positions.clear()
+
     ### Function that takes the new positional offset -w.r.t. the rest transform- as a 3D vector and translates it into a 4x4 matrix
-    #   that expresses the bone position of the bone in world space
+    #   that expresses the bone position of the bone in world space (applied with the other updates of the tick, see apply_pending_updates)
     #!  It applies only to the hip bone, while the other bones have just an Identity matrix as positional matrix since they do not get directly displaced during the animation 
     def update_bone_position(self, tracer_pos: Parameter, new_value: Vector):
         bone_name = tracer_pos.name.split("-")[0] # Extracting the name of the bone from the name of the parameter -e.g: hip-location -> hip-
@@ -172,6 +221,7 @@ class SceneObjectCharacter(SceneObject):
             self.local_translation_map[bone_name] = Matrix.Translation(new_value.xzy - rest_t)
         else:
             self.local_translation_map[bone_name] = Matrix.Identity(4)
+        self.pending_positions.add(bone_name)
 
     ### Function that updates the Tracer ID of the Control Path associated with the current Character in the list of Tracer Parameters
     def update_control_path_id(self):
@@ -185,17 +235,62 @@ class SceneObjectCharacter(SceneObject):
             if path_ID >= 0:
                 self.parameter_list[-1] = Parameter(value=path_ID, name=self.blender_object.name+"-control_path", parent_object=self)
 
-    ### Writing the animation data received from TRACER -usually AnimHost- and replacing the previous animation data
-    def populate_timeline_with_animation(self):
-        # Retrieve the character object's armature on which to apply the animation data
-        target_character_obj: bpy.types.Armature = self.blender_object
-        # Clear the timeline from the old animation if there is one or initialise the data structure if there isn't one yet
-        if target_character_obj.animation_data == None:
-            target_character_obj.animation_data_create().action = bpy.data.actions.new("AnimHost Output")
-        elif target_character_obj.animation_data.action:
-            bpy.data.actions.remove(target_character_obj.animation_data.action)
-            target_character_obj.animation_data.action = bpy.data.actions.new("AnimHost Output")
+    ### The batched pose solver of the armature, created on first use (the rest pose of the character is fixed)
+    def get_pose_solver(self) -> PoseSolver:
+        if self.pose_solver == None:
+            self.pose_solver = PoseSolver(self.armature_obj_bones_rest_data, self.local_bone_rest_transform)
+        return self.pose_solver
+
+    ### The animated location and rotation parameters of the bones of the armature
+    def get_animated_bone_parameters(self) -> list[Parameter]:
+        bone_names = set(self.get_pose_solver().bone_names)
+        return [parameter for parameter in self.parameter_list
+                if parameter.is_animated and parameter.name.split("-")[0] in bone_names and parameter.name.split("-")[1] in ("location", "rotation_quaternion")]
+
+    ### Computing the location and rotation channels of all animated bones for all frames at once
+    #   Same math as bake_animation_per_key, evaluated with the batched pose solver
+    #   @param  frames  Frames to compute, all the key times of the animated parameters by default
+    #   @returns    bone name -> (frames, locations, rotations (WXYZ)), for every animated bone
+    def bake_animation(self, frames: np.ndarray = None) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        solver = self.get_pose_solver()
+        bone_index = {bone_name: i for i, bone_name in enumerate(solver.bone_names)}
+        parameters = {parameter.name: parameter for parameter in self.parameter_list}
+        animated = self.get_animated_bone_parameters()
+        if len(animated) == 0:
+            return {}
+        if frames is None:
+            frames = np.unique(np.concatenate([parameter.key_list.get_times() for parameter in animated]))
 
+        rotations = np.empty((len(solver), len(frames), 4))
+        translations = np.zeros((len(solver), len(frames), 3))
+        for i, bone_name in enumerate(solver.bone_names):
+            rotation_parameter = parameters.get(bone_name+"-rotation_quaternion")
+            if rotation_parameter != None and rotation_parameter.is_animated:
+                rotations[i] = sample_keys(rotation_parameter, frames)[:, [3, 0, 1, 2]]  # XYZW -> WXYZ
+            elif rotation_parameter != None:
+                rotations[i] = tuple(rotation_parameter.value)
+            else:
+                rotations[i] = (1, 0, 0, 0)
+
+            # Only the hip bone gets displaced, by its offset from the rest position
+            location_parameter = parameters.get(bone_name+"-location")
+            if bone_name == "hip" and location_parameter != None and location_parameter.is_animated:
+                translations[i] = sample_keys(location_parameter, frames) - solver.rest_translations[i]
+
+        locations, quaternions = decompose(solver.solve(rotations, translations))
+
+        channels = {}
+        for parameter in animated:
+            bone_name = parameter.name.split("-")[0]
+            if bone_name not in channels:
+                i = bone_index[bone_name]
+                channels[bone_name] = (frames, locations[i], quaternions[i])
+        return channels
+
+    ### Computing the location and rotation channels of all animated bones key by key with mathutils and Bone.convert_local_to_pose
+    #   Used for rigs with bones the pose solver does not support (see PoseSolver.supports)
+    #   @returns    bone name -> (frames, locations, rotations (WXYZ)), for every animated bone
+    def bake_animation_per_key(self) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
         # Matrices encoding the positional offsets form rest pose for every keyframe of the hip bone -the other bones won't get displaced-
         local_pos_offest_from_rest: dict[str, dict[int, Matrix]] = {}
         for parameter in self.parameter_list:
@@ -226,35 +321,180 @@ class SceneObjectCharacter(SceneObject):
                     offsets[key.time] = new_rotation_matrix
                 local_rot_offest_from_rest[bone_name] = offsets
 
-        # Resizing the range of the timeline according to the number of keyframes received -arbitrarily choosing the number of keys from the hip rotation parameter-
-        bpy.context.scene.frame_end   = len(self.parameter_list[3].get_key_list()) - 1
-
-        # For every keyframe in every parameter, compute the combination of positional and rotational offsets,
-        # convert the resulting local matrix into pose space and add keyframe for location and rotation in the timeline at the right time
-        last_frame = 0
+        # For every keyframe in every parameter, compute the combination of positional and rotational offsets
+        # and convert the resulting local matrix into pose space (the matrix_basis of the bone at that frame)
+        pose_matrices: dict[str, dict[float, Matrix]] = {}
         for parameter in self.parameter_list:
             bone_name, param_type = parameter.name.split("-")
             if parameter.is_animated and (param_type == "location" or param_type == "rotation_quaternion"):
                 target_bone: bpy.types.PoseBone = self.armature_obj_pose_bones[bone_name]
+                pose_bone: bpy.types.Bone = target_bone.bone
+                bone_matrices = pose_matrices.setdefault(bone_name, {})
 
                 for key in parameter.get_key_list():
                     rotation_matrix = local_rot_offest_from_rest[bone_name][key.time]
                     translation_matrix = local_pos_offest_from_rest[bone_name][key.time] if bone_name == "hip" else Matrix.Identity(4) # The translation matrix is defined only for the hip bone
-                    pose_bone: bpy.types.Bone = target_bone.bone
                     new_matrix: Matrix = translation_matrix @ rotation_matrix
-                    # Assigning the correct local transformation matrix to the Pose Bone Object -given the parent transform, if there is one-
+                    # The local transformation matrix of the Pose Bone Object -given the parent transform, if there is one-
                     if target_bone.parent:
                         parent_rotation_matrix = local_rot_offest_from_rest[target_bone.parent.name][key.time]
-                        target_bone.matrix_basis = pose_bone.convert_local_to_pose( new_matrix, pose_bone.matrix_local,
-                                                                                    parent_matrix = parent_rotation_matrix,
-                                                                                    parent_matrix_local = pose_bone.parent.matrix_local,
-                                                                                    invert=True )
+                        bone_matrices[key.time] = pose_bone.convert_local_to_pose( new_matrix, pose_bone.matrix_local,
+                                                                                   parent_matrix = parent_rotation_matrix,
+                                                                                   parent_matrix_local = pose_bone.parent.matrix_local,
+                                                                                   invert=True )
                     else:
-                        target_bone.matrix_basis = pose_bone.convert_local_to_pose( new_matrix, pose_bone.matrix_local, invert=True )
-                    # Write keyframe for both location and rotation of the current bone at the current frame
-                    target_character_obj.keyframe_insert('pose.bones["'+ bone_name +'"].location', frame=key.time)
-                    target_character_obj.keyframe_insert('pose.bones["'+ bone_name +'"].rotation_quaternion', frame=key.time)
-                    last_frame = key.time
+                        bone_matrices[key.time] = pose_bone.convert_local_to_pose( new_matrix, pose_bone.matrix_local, invert=True )
+
+        # Decompose the matrices into the location and rotation channels of every bone
+        channels = {}
+        for bone_name, bone_matrices in pose_matrices.items():
+            frames = np.fromiter(bone_matrices.keys(), dtype=np.float32, count=len(bone_matrices))
+            locations = np.empty((len(frames), 3), dtype=np.float32)
+            rotations = np.empty((len(frames), 4), dtype=np.float32)
+            for i, matrix in enumerate(bone_matrices.values()):
+                location, rotation, scale = matrix.decompose()
+                locations[i] = location
+                rotations[i] = rotation
+            channels[bone_name] = (frames, locations, rotations)
+        return channels
+
+
+    ### Writing the animation data received from TRACER -usually AnimHost- and replacing the previous animation data
+    #   While AnimHost is streaming, the received blocks are only buffered (see stream_animation)
+    def populate_timeline_with_animation(self):
+        if self.stream_mode in (AnimHostRPC.STREAM, AnimHostRPC.STREAM_LOOP) and self.get_pose_solver().is_supported:
+            self.stream_animation()
+        # Only the changed keys are baked again if the action of the last bake is still there
+        elif not self.rebake_animation():
+            # Location and rotation channels of every animated bone in pose space
+            if self.get_pose_solver().is_supported:
+                channels = self.bake_animation()
+            else:
+                channels = self.bake_animation_per_key()
+
+            # Resizing the range of the timeline according to the number of keyframes received -arbitrarily choosing the number of keys from the hip rotation parameter-
+            self.write_animation(channels, len(self.parameter_list[3].key_list) - 1)
+            self.baked_frames = next(iter(channels.values()))[0] if self.get_pose_solver().is_supported and len(channels) > 0 else None
+
+        # All received keys are in the action now, the next rebake only considers the keys changed from here on
+        for parameter in self.parameter_list:
+            if parameter.is_animated:
+                parameter.key_list.reset_changes()
+
+    ### Baking again only the key ranges that changed since the last bake, in the existing action
+    #   The changed ranges are recorded by the key lists (see KeyList.changed_range). Only the F-Curves of the bones with changed keys
+    #   are spliced, the other F-Curves of the action are kept.
+    #   If the frames of the changed range are different from the baked ones all animated bones are spliced, like a complete bake would do.
+    #   @returns    False if the animation has to be baked completely (no action from a previous bake, saved action, unsupported rig, changed frames outside the changed range)
+    def rebake_animation(self) -> bool:
+        target_character_obj: bpy.types.Object = self.blender_object
+        if self.baked_frames is None or target_character_obj.animation_data == None or target_character_obj.animation_data.action == None:
+            return False
+        # An action that has been saved into an NLA track (see AnimationSave) is not modified
+        if target_character_obj.animation_data.action.users > 1:
+            return False
+        solver = self.get_pose_solver()
+        animated = self.get_animated_bone_parameters()
+        changed = [parameter for parameter in animated if parameter.key_list.has_changed and parameter.key_list.changed_range != None]
+        if len(animated) == 0:
+            return False
+        if len(changed) == 0:
+            return True
+
+        start_frame = min(parameter.key_list.changed_range[0] for parameter in changed)
+        end_frame   = max(parameter.key_list.changed_range[1] for parameter in changed)
+        frames = np.unique(np.concatenate([parameter.key_list.get_times() for parameter in animated]))
+        in_range = (frames >= start_frame) & (frames <= end_frame)
+        baked_in_range = (self.baked_frames >= start_frame) & (self.baked_frames <= end_frame)
+        if not np.array_equal(frames[~in_range], self.baked_frames[~baked_in_range]):
+            return False
+
+        # Bones with changed keys, the rotation of a parent cancels out of the matrix_basis of its children (see PoseSolver)
+        affected = set(parameter.name.split("-")[0] for parameter in changed)
+        if not np.array_equal(frames[in_range], self.baked_frames[baked_in_range]):
+            affected = set(solver.bone_names)
+
+        channels = self.bake_animation(frames[in_range])
+        action = target_character_obj.animation_data.action
+        for bone_name, (range_frames, locations, rotations) in channels.items():
+            if bone_name in affected:
+                splice_fcurves(action, 'pose.bones["'+ bone_name +'"].location', range_frames, locations, start_frame, end_frame)
+                splice_fcurves(action, 'pose.bones["'+ bone_name +'"].rotation_quaternion', range_frames, rotations, start_frame, end_frame)
+        self.baked_frames = frames
+
+        bpy.context.scene.frame_end = len(self.parameter_list[3].key_list) - 1
+        bpy.ops.wm.report_received_animation('EXEC_DEFAULT')
+        return True
+
+    ### Writing location and rotation channels into a new action of the character, replacing the previous animation data
+    #   @param  channels    bone name -> (frames, locations, rotations (WXYZ)), see bake_animation
+    #   @param  frame_end   Last frame of the timeline
+    def write_animation(self, channels: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]], frame_end: int):
+        # Retrieve the character object's armature on which to apply the animation data
+        target_character_obj: bpy.types.Armature = self.blender_object
+        # Clear the timeline from the old animation if there is one or initialise the data structure if there isn't one yet
+        if target_character_obj.animation_data == None:
+            target_character_obj.animation_data_create().action = bpy.data.actions.new("AnimHost Output")
+        elif target_character_obj.animation_data.action:
+            bpy.data.actions.remove(target_character_obj.animation_data.action)
+            target_character_obj.animation_data.action = bpy.data.actions.new("AnimHost Output")
+        else:
+            target_character_obj.animation_data.action = bpy.data.actions.new("AnimHost Output")
+
+        bpy.context.scene.frame_end = frame_end
+
+        # Write the channels of every bone into the action at once
+        action = target_character_obj.animation_data.action
+        for bone_name, (frames, locations, rotations) in channels.items():
+            write_fcurves(action, 'pose.bones["'+ bone_name +'"].location', frames, locations)
+            write_fcurves(action, 'pose.bones["'+ bone_name +'"].rotation_quaternion', frames, rotations)
 
         # REPORT (not displaying on UI...why?)
-        bpy.ops.wm.report_received_animation('EXEC_DEFAULT')
\ No newline at end of file
+        bpy.ops.wm.report_received_animation('EXEC_DEFAULT')
+
+    ### Function that sets how the next animations from AnimHost are received (see AnimationRequest)
+    #   Stopping or replacing a stream writes the buffered poses into the action of the character
+    def set_stream_mode(self, mode: AnimHostRPC):
+        if self.pose_stream != None and len(self.pose_stream) > 0:
+            self.write_animation(self.pose_stream.get_channels(), int(self.pose_stream.last_frame()))
+            self.pose_stream.clear()
+            self.baked_frames = None
+        self.stream_mode = mode
+
+    ### Receiving a block of the pose stream of AnimHost
+    #   Only the frames after the newest buffered one are computed and pushed into the pose stream, then the newest pose is applied to the rig.
+    #   The action is written once, when the stream ends (see set_stream_mode), so the cost of a block does not grow with the length of the stream.
+    def stream_animation(self):
+        animated = self.get_animated_bone_parameters()
+        if len(animated) == 0:
+            return
+        if self.pose_stream == None:
+            self.pose_stream = PoseStream(self.get_pose_solver().bone_names)
+
+        # Detach the previous animation at the start of a stream, it would override the streamed pose on frame changes
+        if len(self.pose_stream) == 0 and self.blender_object.animation_data != None and self.blender_object.animation_data.action:
+            bpy.data.actions.remove(self.blender_object.animation_data.action)
+
+        # Keys that end before the newest buffered frame mean the stream started over (e.g. the next loop of a looping stream)
+        last_frame = self.pose_stream.last_frame()
+        newest_key = max((float(parameter.key_list.get_times()[-1]) for parameter in animated if len(parameter.key_list) > 0), default=None)
+        if last_frame != None and newest_key != None and newest_key < last_frame:
+            self.pose_stream.clear()
+            last_frame = None
+
+        new_times = []
+        for parameter in animated:
+            times = parameter.key_list.get_times()
+            new_times.append(times if last_frame == None else times[np.searchsorted(times, last_frame, side='right'):])
+        frames = np.unique(np.concatenate(new_times))
+        if len(frames) == 0:
+            return
+
+        self.pose_stream.push(frames, self.bake_animation(frames))
+
+        # Apply the newest pose to the rig
+        frame, locations, rotations = self.pose_stream.latest()
+        for i in np.flatnonzero(self.pose_stream.streamed):
+            pose_bone: bpy.types.PoseBone = self.armature_obj_pose_bones[self.pose_stream.bone_names[i]]
+            pose_bone.location = locations[i]
+            pose_bone.rotation_quaternion = rotations[i]
@@ -0,0 +1,103 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import bpy
+import numpy as np
+
+## Write the keys of all components of an animated property into an action at once
+#  Creates one F-Curve per component and fills it with keyframe_points.add + foreach_set,
+#  instead of one keyframe_insert per key. The keys get Blender's defaults for new keyframes
+#  (bezier interpolation, auto clamped handles), which are also the defaults of keyframe_insert.
+#  Existing F-Curves of the property are replaced.
+#  @param data_path     RNA path of the property, relative to the animated ID (e.g. 'pose.bones["hip"].location')
+#  @param frames        (n,) frames of the keys
+#  @param values        (n, components) values of the keys
+#  @param group         Name of the action group of the F-Curves (none by default, like keyframe_insert on a path of the object)
+def write_fcurves(action: bpy.types.Action, data_path: str, frames: np.ndarray, values: np.ndarray, group: str = ""):
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32).reshape(len(frames), -1)
+    for index in range(values.shape[1]):
+        fcurve = action.fcurves.find(data_path, index=index)
+        if fcurve != None:
+            action.fcurves.remove(fcurve)
+        write_fcurve(action, data_path, index, frames, values[:, index], group)
+
+## Create the F-Curve of one component of a property and fill it with keys (see write_fcurves)
+def write_fcurve(action: bpy.types.Action, data_path: str, index: int, frames: np.ndarray, values: np.ndarray, group: str = ""):
+    co = np.empty(2 * len(frames), dtype=np.float32)
+    co[0::2] = frames
+    co[1::2] = values
+    fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+    fcurve.keyframe_points.add(len(frames))
+    fcurve.keyframe_points.foreach_set('co', co)
+    # sorts the keys and computes the auto handles
+    fcurve.update()
+
+## Replace the keys of an animated property within a frame range, keeping the other keys of its F-Curves
+#  If the number of keys changes the F-Curve is refilled and all its keys get the defaults of write_fcurves.
+#  F-Curves that do not exist yet are created with the given keys.
+#  @param frames        (n,) frames of the new keys, within start_frame and end_frame
+#  @param values        (n, components) values of the new keys
+#  @param start_frame   First frame of the replaced range
+#  @param end_frame     Last frame of the replaced range
+def splice_fcurves(action: bpy.types.Action, data_path: str, frames: np.ndarray, values: np.ndarray,
+                   start_frame: float, end_frame: float, group: str = ""):
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32)
+    # the range can be empty (keys removed), the number of components comes from the shape of values
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+
+    for index in range(values.shape[1]):
+        fcurve = action.fcurves.find(data_path, index=index)
+        if fcurve == None:
+            write_fcurve(action, data_path, index, frames, values[:, index], group)
+            continue
+        points = fcurve.keyframe_points
+        old = np.empty(2 * len(points), dtype=np.float32)
+        points.foreach_get('co', old)
+        old_frames = old[0::2]
+        before = old_frames < start_frame
+        after  = old_frames > end_frame
+
+        co = np.empty(2 * (np.count_nonzero(before) + len(frames) + np.count_nonzero(after)), dtype=np.float32)
+        co[0::2] = np.concatenate((old_frames[before], frames, old_frames[after]))
+        co[1::2] = np.concatenate((old[1::2][before], values[:, index], old[1::2][after]))
+        if len(co) != len(old):
+            points.clear()
+            points.add(len(co) // 2)
+        points.foreach_set('co', co)
+        # sorts the keys and computes the auto handles
+        fcurve.update()
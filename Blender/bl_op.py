@@ -48,7 +48,7 @@ from .settings import TracerData, TracerProperties
 from .SceneObjects.SceneObject import SceneObject
 from .SceneObjects.SceneObjectCharacter import SceneObjectCharacter
 from .AbstractParameter import Parameter, AnimHostRPC
-from .serverAdapter import send_RPC_msg, send_parameter_update, set_up_thread, close_socket_d, close_socket_s, close_socket_c, close_socket_u
+from .serverAdapter import send_RPC_msg, send_parameter_update, set_up_thread, update_distributed_scene, close_socket_d, close_socket_s, close_socket_c, close_socket_u
 from .tools import clean_up_tracer_data, install_ZMQ, check_ZMQ, setup_tracer_collection, parent_to_root, add_path, make_point, add_point, move_point, update_curve, path_points_check
 from .sceneDistribution import gather_scene_data, process_control_path#, resendCurve
 from .GenerateSkeletonObj import process_armature
@@ -125,6 +125,7 @@ class UpdateScene(bpy.types.Operator):
         print('Updating scene data...')
         clean_up_tracer_data(level=2)
         objCount = gather_scene_data()
+        update_distributed_scene()    # every client has to fetch the new scene
         if objCount > 0:
             self.report({'INFO'}, f'Sending {str(objCount)} Objects to TRACER')
         return {'FINISHED'}
@@ -610,6 +611,9 @@ class AnimationRequest(bpy.types.Operator):
                         case 'STOP':
                             self.animation_request.value = AnimHostRPC.STOP.value
                     send_RPC_msg(self.animation_request)
+                    # Let the character know whether the animation comes as a block or as a stream of poses
+                    if bpy.data.objects[character_name].tracer_id < len(tracer_data.SceneObjects):
+                        tracer_character_object.set_stream_mode(AnimHostRPC(self.animation_request.value))
 
                     self.mix_root_translation_param.value   = self.tracer_props.mix_root_translation
                     self.mix_root_rotation_param.value      = self.tracer_props.mix_root_rotation
@@ -82,6 +82,31 @@ class TRACER_PT_Panel(TRACER_Panel, bpy.types.Panel):
             col2 = row.column()
             col2.operator(UpdateScene.bl_idname, text = UpdateScene.bl_label)
 
+        network = context.window_manager.tracer_data.network
+        if DoDistribute.is_distributed and network != None:
+            stats = network.stats()
+            row = layout.row()
+            row.label(text=f"Queues in/out: {stats['inbound']}/{stats['outbound']}  Tick: {stats['tick_ms']} ms")
+            row = layout.row()
+            row.label(text=f"Clients: {stats['clients']}  Scene requests: {stats['scene_requests']}")
+
+        # Cache statistics of the last scene gathering
+        geo_cache = context.window_manager.tracer_data.geoCache
+        if DoDistribute.is_distributed and geo_cache != None:
+            stats = geo_cache.stats()
+            row = layout.row()
+            row.label(text=f"Geometry cache hits/misses: {stats['hits']}/{stats['misses']}  {stats['bytes'] / 2**20:.1f} MB")
+        texture_store = context.window_manager.tracer_data.textureStore
+        if DoDistribute.is_distributed and texture_store != None:
+            stats = texture_store.stats()
+            row = layout.row()
+            row.label(text=f"Textures read/reused: {stats['reads']}/{stats['hits']}")
+        texture_cache = context.window_manager.tracer_data.textureCache
+        if DoDistribute.is_distributed and texture_cache != None:
+            stats = texture_cache.stats()
+            row = layout.row()
+            row.label(text=f"Texture cache hits/misses: {stats['hits']}/{stats['misses']}  {stats['bytes'] / 2**20:.1f} MB")
+
 # Define Layout for the Character Panel, grouping functionalities related to the character to animate
 class TRACER_PT_Object_Panel(TRACER_Panel, bpy.types.Panel):
     bl_idname = "TRACER_PT_OBJECT_PANEL"
@@ -0,0 +1,104 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import time
+
+## Scene requests answered by the distributor, in the order a client asks for them
+SCENE_REQUESTS = ("header", "nodes", "objects", "characters", "textures", "materials")
+
+## Request state of one connected client
+class clientState:
+    def __init__(self, identity: bytes):
+        self.identity = identity
+        self.first_request_time = time.perf_counter()
+        self.last_request_time = self.first_request_time
+        self.last_request = ""
+        self.requests = 0
+        self.bytes_sent = 0
+        self.pending: set[str] = set(SCENE_REQUESTS)   # scene parts the client has not received yet
+
+    @property
+    def has_full_scene(self) -> bool:
+        return len(self.pending) == 0
+
+## Scene distribution over a ZMQ ROUTER socket
+#  Clients connect with REQ (or DEALER) sockets and request the scene part by part.
+#  Unlike a REP socket, the ROUTER socket does not serve requests in lockstep: every call of
+#  serve answers all pending requests of all clients (up to a time budget), and every reply is
+#  routed back to its client through the identity envelope of the request.
+class DistributionServer:
+    def __init__(self, socket):
+        self.socket = socket
+        self.clients: dict[bytes, clientState] = {}
+
+    ## Answer the pending requests of all clients
+    #  @param payloads  Request name -> scene data to send (unknown requests get an empty reply)
+    #  @param budget    Maximum time in seconds spent per call, at least one request is served
+    #  @returns         Number of requests served
+    def serve(self, payloads: dict, budget: float = 0.02) -> int:
+        import zmq
+        served = 0
+        start = time.perf_counter()
+        while served == 0 or time.perf_counter() - start < budget:
+            try:
+                frames = self.socket.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                break
+
+            # REQ clients send [identity, empty delimiter, request], DEALER clients may omit the delimiter
+            envelope, request = frames[:-1], frames[-1].decode(errors='replace')
+            data = payloads.get(request, b"")
+            self.socket.send_multipart(envelope + [data])
+
+            client = self.clients.get(envelope[0])
+            if client == None:
+                client = self.clients[envelope[0]] = clientState(envelope[0])
+            client.last_request = request
+            client.last_request_time = time.perf_counter()
+            client.requests += 1
+            client.bytes_sent += len(data)
+            client.pending.discard(request)
+            served += 1
+        return served
+
+    ## Forget all clients (e.g. when the scene is sent again)
+    def reset_clients(self):
+        self.clients.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"clients": len(self.clients),
+                "complete": sum(1 for client in self.clients.values() if client.has_full_scene),
+                "requests": sum(client.requests for client in self.clients.values()),
+                "bytes_sent": sum(client.bytes_sent for client in self.clients.values())}
@@ -0,0 +1,143 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import os
+
+## Persistent, content-addressed cache of packed geometry byte blocks
+#  Every entry is one file named after the content hash of the mesh data it was produced from
+#  (see geoProcessing.content_hash) and holds the exact byte block written by get_geo_bytes_array.
+#  The file modification time is used as last access time: hits touch the file and, when the
+#  total size exceeds the cap, the least recently used entries are evicted first.
+class GeoCache:
+    FILE_EXTENSION = ".tgeo"
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+        # key: size in bytes of every entry currently on disk
+        self.__entries: dict[str, int] = {}
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.FILE_EXTENSION):
+                self.__entries[entry.name[:-len(self.FILE_EXTENSION)]] = entry.stat().st_size
+        self.total_bytes = sum(self.__entries.values())
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.write_errors = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__entries
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.FILE_EXTENSION)
+
+    ## Return the cached byte block for a content hash, or None on a miss
+    def get(self, key: str) -> bytes | None:
+        if key in self.__entries:
+            try:
+                with open(self.path(key), 'rb') as cache_file:
+                    data = cache_file.read()
+                os.utime(self.path(key))    # mark as most recently used
+                self.hits += 1
+                self.bytes_read += len(data)
+                return data
+            except OSError:
+                # The entry vanished or is unreadable, forget about it
+                self.total_bytes -= self.__entries.pop(key)
+        self.misses += 1
+        return None
+
+    ## Store the byte block for a content hash, evicting least recently used entries if needed
+    def put(self, key: str, data: bytes | bytearray):
+        if len(data) > self.max_bytes:
+            return
+        if key in self.__entries:
+            self.total_bytes -= self.__entries.pop(key)
+
+        self.evict(self.max_bytes - len(data))
+
+        # Write to a temporary file first, so that an interrupted write never leaves a truncated entry
+        temp_path = self.path(key) + ".tmp"
+        try:
+            with open(temp_path, 'wb') as cache_file:
+                cache_file.write(data)
+            os.replace(temp_path, self.path(key))
+        except OSError:
+            # the entry is simply missing from the cache, see stats
+            self.write_errors += 1
+            return
+        self.__entries[key] = len(data)
+        self.total_bytes += len(data)
+        self.bytes_written += len(data)
+
+    ## Remove least recently used entries until the cache holds at most max_total bytes
+    def evict(self, max_total: int):
+        if self.total_bytes <= max_total:
+            return
+        by_last_use = sorted(self.__entries, key=lambda key: self.__last_use(key))
+        for key in by_last_use:
+            if self.total_bytes <= max_total:
+                break
+            try:
+                os.remove(self.path(key))
+            except OSError:
+                pass
+            self.total_bytes -= self.__entries.pop(key)
+            self.evictions += 1
+
+    def clear(self):
+        self.evict(0)
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self), "bytes": self.total_bytes, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "bytes_read": self.bytes_read, "bytes_written": self.bytes_written,
+                "write_errors": self.write_errors}
+
+    def __last_use(self, key: str) -> float:
+        try:
+            return os.stat(self.path(key)).st_mtime
+        except OSError:
+            return 0.0
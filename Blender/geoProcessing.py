@@ -0,0 +1,330 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import hashlib
+import numpy as np
+
+from .skinWeights import gather_vertex_groups, select_top_influences
+
+## Version of the geometry processing output, part of every content hash.
+#  Increase it whenever the produced geometry bytes change for the same input.
+GEO_FORMAT_VERSION = 1
+
+## Container for the per-corner mesh data extracted in bulk from a Blender Mesh
+#  Every array has one row per triangle corner (3 * number of loop triangles),
+#  already converted into the TRACER (Unity) coordinate system and winding order
+class meshArrays:
+    positions:      np.ndarray  # (n_corners, 3) float32, Y-Z swapped
+    normals:        np.ndarray  # (n_corners, 3) float32, Y-Z swapped
+    uvs:            np.ndarray  # (n_corners, 2) float32
+    corner_verts:   np.ndarray  # (n_corners,)   int32, index of the original mesh vertex of each corner
+
+    def __init__(self, positions, normals, uvs, corner_verts):
+        self.positions = positions
+        self.normals = normals
+        self.uvs = uvs
+        self.corner_verts = corner_verts
+
+    def __len__(self) -> int:
+        return len(self.corner_verts)
+
+## Read a per-element attribute of a bpy collection into a flat NumPy array using foreach_get
+#  @param collection    The bpy_prop_collection to read from (e.g. mesh.vertices)
+#  @param attribute     Name of the attribute to read (e.g. 'co')
+#  @param dtype         NumPy data type of the attribute
+#  @param width         Number of components per element
+#  @returns             Array of shape (len(collection), width), or (len(collection),) if width is 1
+def read_attribute(collection, attribute: str, dtype, width: int = 1) -> np.ndarray:
+    data = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attribute, data)
+    return data.reshape(-1, width) if width > 1 else data
+
+## Raw mesh arrays read from a Blender Mesh with foreach_get
+#  This is the only part of the geometry processing that needs to touch bpy data,
+#  everything computed from it (corners, welding, skinning) is pure NumPy.
+class rawMeshData:
+    co:             np.ndarray  # (n_verts, 3) float32
+    vert_normals:   np.ndarray  # (n_verts, 3) float32
+    loop_verts:     np.ndarray  # (n_loops,) int32
+    loop_edges:     np.ndarray  # (n_loops,) int32
+    loop_uvs:       np.ndarray  # (n_loops, 2) float32 or None if the mesh has no UV map
+    tri_loops:      np.ndarray  # (n_tris, 3) int32
+    tri_polys:      np.ndarray  # (n_tris,) int32
+    poly_start:     np.ndarray  # (n_polys,) int32
+    poly_total:     np.ndarray  # (n_polys,) int32
+    poly_normals:   np.ndarray  # (n_polys, 3) float32
+    edge_smooth:    np.ndarray  # (n_edges,) bool
+    use_smooth:     bool        # smooth shading flag of the first polygon (applied to the whole mesh)
+    skin:           tuple       # CSR vertex group arrays (offsets, groups, weights) or None if not skinned
+
+## Read all arrays needed to process a mesh in bulk
+#  @param mesh_data     The bpy.types.Mesh to read
+#  @param skinned       Whether the vertex group memberships should be read as well
+#  @returns             A rawMeshData instance
+def read_mesh_data(mesh_data, skinned: bool = False) -> rawMeshData:
+    mesh_data.calc_loop_triangles()
+    raw = rawMeshData()
+
+    raw.co           = read_attribute(mesh_data.vertices,        'co',            np.float32, 3)
+    raw.vert_normals = read_attribute(mesh_data.vertex_normals,  'vector',        np.float32, 3)
+    raw.loop_verts   = read_attribute(mesh_data.loops,           'vertex_index',  np.int32)
+    raw.loop_edges   = read_attribute(mesh_data.loops,           'edge_index',    np.int32)
+    raw.tri_loops    = read_attribute(mesh_data.loop_triangles,  'loops',         np.int32, 3)
+    raw.tri_polys    = read_attribute(mesh_data.loop_triangles,  'polygon_index', np.int32)
+    raw.poly_start   = read_attribute(mesh_data.polygons,        'loop_start',    np.int32)
+    raw.poly_total   = read_attribute(mesh_data.polygons,        'loop_total',    np.int32)
+    raw.poly_normals = read_attribute(mesh_data.polygon_normals, 'vector',        np.float32, 3)
+    raw.use_smooth   = len(mesh_data.polygons) > 0 and mesh_data.polygons[0].use_smooth
+
+    if mesh_data.uv_layers.active != None:
+        raw.loop_uvs = read_attribute(mesh_data.uv_layers.active.data, 'uv', np.float32, 2)
+    else:
+        raw.loop_uvs = None
+
+    sharp_attribute = mesh_data.attributes.get("sharp_edge")
+    if sharp_attribute != None:
+        raw.edge_smooth = ~read_attribute(sharp_attribute.data, 'value', bool)
+    else:
+        raw.edge_smooth = np.ones(len(mesh_data.edges), dtype=bool)
+
+    raw.skin = gather_vertex_groups(mesh_data.vertices) if skinned else None
+    return raw
+
+## Extract positions, corner normals, UVs and triangle corners of a mesh in bulk
+#  Replaces the per-loop bmesh walk of processGeoNew: the old path flipped every face,
+#  triangulated the flipped faces and negated the (now inverted) normals on output.
+#  Here the loop triangles of the mesh are used with their winding reversed, together with the original normals.
+#  The result is equivalent geometry but not byte-identical to the bmesh path: for quads the triangles
+#  are the same but their corners come in a different order, and n-gons can be triangulated differently.
+#  @param mesh_data     The bpy.types.Mesh to read
+#  @returns             A meshArrays instance holding one row per triangle corner
+def extract_mesh_arrays(mesh_data) -> meshArrays:
+    return corner_arrays(read_mesh_data(mesh_data))
+
+## Compute the per-corner arrays from the raw mesh arrays (no bpy access)
+#  @param raw           The rawMeshData of the mesh
+#  @returns             A meshArrays instance holding one row per triangle corner
+def corner_arrays(raw: rawMeshData) -> meshArrays:
+    # Flipping a triangle (a, b, c) keeps its first corner and reverses the others: (a, c, b)
+    corner_loops = raw.tri_loops[:, [0, 2, 1]].ravel()
+    corner_polys = np.repeat(raw.tri_polys, 3)
+    corner_verts = raw.loop_verts[corner_loops]
+
+    normals = corner_normals(raw, corner_loops, corner_polys, corner_verts)
+
+    if raw.loop_uvs is not None:
+        uvs = raw.loop_uvs[corner_loops]
+    else:
+        uvs = np.zeros((len(corner_loops), 2), dtype=np.float32)
+
+    # Axis swap from Blender (Z up) to Unity (Y up)
+    positions = np.ascontiguousarray(raw.co[corner_verts][:, [0, 2, 1]])
+    normals   = np.ascontiguousarray(normals[:, [0, 2, 1]])
+
+    return meshArrays(positions, normals, np.ascontiguousarray(uvs), corner_verts)
+
+## Compute the normal of each triangle corner, following the same smoothing rules as the bmesh path
+#  A corner is smooth if the mesh is smooth shaded and the edge leading into the corner's
+#  vertex is not marked sharp (after flipping, bmesh reports that edge as the loop edge).
+#  Smooth corners take the vertex normal, all others the polygon normal.
+#  @param raw           The rawMeshData of the mesh
+#  @param corner_loops  Loop index of every triangle corner
+#  @param corner_polys  Polygon index of every triangle corner
+#  @param corner_verts  Vertex index of every triangle corner
+#  @returns             Array of shape (n_corners, 3) with the corner normals in Blender space
+def corner_normals(raw: rawMeshData, corner_loops: np.ndarray, corner_polys: np.ndarray, corner_verts: np.ndarray) -> np.ndarray:
+    normals = raw.poly_normals[corner_polys]
+
+    if not raw.use_smooth:
+        return normals
+
+    # Previous loop of every loop inside its own polygon (cyclic)
+    loop_polys = np.repeat(np.arange(len(raw.poly_start), dtype=np.int32), raw.poly_total)
+    loop_start = raw.poly_start[loop_polys]
+    loop_total = raw.poly_total[loop_polys]
+    prev_loops = loop_start + (np.arange(len(raw.loop_edges), dtype=np.int32) - loop_start - 1) % loop_total
+
+    corner_smooth = raw.edge_smooth[raw.loop_edges[prev_loops[corner_loops]]]
+    normals[corner_smooth] = raw.vert_normals[corner_verts[corner_smooth]]
+    return normals
+
+## Hash the raw mesh arrays together with the processing options
+#  Two meshes with the same hash produce the same geometry byte block, so the hash can
+#  be used as a content address (e.g. for the persistent geometry cache).
+#  Normals are derived from positions and topology and therefore not hashed.
+#  @param raw           The rawMeshData of the mesh
+#  @param options       Any processing options that influence the output (e.g. weld tolerance)
+#  @returns             Hexadecimal digest string
+def content_hash(raw: rawMeshData, *options) -> str:
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((GEO_FORMAT_VERSION, raw.use_smooth, raw.loop_uvs is not None, raw.skin is not None) + options).encode())
+    arrays = [raw.co, raw.loop_verts, raw.loop_edges, raw.tri_loops, raw.tri_polys, raw.poly_start, raw.poly_total, raw.edge_smooth]
+    if raw.loop_uvs is not None:
+        arrays.append(raw.loop_uvs)
+    if raw.skin is not None:
+        arrays.extend(raw.skin)
+    for array in arrays:
+        digest.update(np.int64(array.size).tobytes())
+        digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+## Deduplicate triangle corners into split vertices and an index buffer in one vectorized pass
+#  Every corner's attributes are packed into one fixed-size binary row (a NumPy void view),
+#  rows are deduplicated with np.unique and the unique rows are renumbered by their first
+#  occurrence, matching the split vertex order of the former tuple hash map.
+#  @param attributes    List of per-corner arrays (all with the same number of rows), the positions first
+#  @param tolerance     If > 0, the positions are quantized to this distance before comparing, merging
+#                       corners at nearly the same place (the first corner's values are kept).
+#                       The other attributes (normals, UVs, bone weights) are always compared exactly.
+#  @returns             (first_corners, index_buffer): for every split vertex the index of the
+#                       first corner that produced it, and for every corner its split vertex index
+def weld_corners(attributes: list[np.ndarray], tolerance: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    n_corners = len(attributes[0])
+    if n_corners == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+
+    columns = []
+    for i, attribute in enumerate(attributes):
+        attribute = attribute.reshape(n_corners, -1)
+        if attribute.dtype.kind == 'f':
+            if i == 0 and tolerance > 0:
+                attribute = np.round(attribute / tolerance).astype(np.int64)
+            else:
+                # Adding 0.0 turns -0.0 into 0.0, so that both compare equal as in the tuple keys
+                attribute = attribute + attribute.dtype.type(0.0)
+        columns.append(np.ascontiguousarray(attribute).view(np.uint8).reshape(n_corners, -1))
+
+    packed = np.ascontiguousarray(np.hstack(columns))
+    keys = packed.view(np.dtype((np.void, packed.shape[1]))).ravel()
+
+    _, first_corners, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    # np.unique numbers the vertices in byte order, renumber them by first occurrence
+    order = np.argsort(first_corners, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    index_buffer = rank[inverse.ravel()].astype(np.int32)
+
+    return first_corners[order], index_buffer
+
+## Split vertex buffers of one processed geometry, in TRACER space
+class processedGeometry:
+    vertices:       np.ndarray  # (n_verts, 3) float32
+    normals:        np.ndarray  # (n_verts, 3) float32
+    uvs:            np.ndarray  # (n_verts, 2) float32
+    indices:        np.ndarray  # (n_indices,) int32
+    bone_weights:   np.ndarray  # (n_verts, 4) float32 or None if not skinned
+    bone_indices:   np.ndarray  # (n_verts, 4) int32 or None if not skinned
+
+## Turn raw mesh arrays into split vertex buffers (corners, skin selection and welding)
+#  Pure NumPy without any bpy access, so it can run on a worker thread while the
+#  main thread keeps reading the next meshes.
+#  @param raw           The rawMeshData of the mesh (with skin arrays if it is skinned)
+#  @param tolerance     Weld tolerance, see weld_corners
+#  @returns             A processedGeometry instance
+def process_geometry(raw: rawMeshData, tolerance: float = 0.0) -> processedGeometry:
+    # triangle corners (positions, normals, uvs already in TRACER space)
+    corners = corner_arrays(raw)
+    corner_attributes = [corners.positions, corners.normals, corners.uvs]
+
+    if raw.skin is not None:
+        # top 4 normalized bone influences of every vertex
+        vert_bone_weights, vert_bone_indices = select_top_influences(*raw.skin)
+        corner_bone_weights = vert_bone_weights[corners.corner_verts]
+        corner_bone_indices = vert_bone_indices[corners.corner_verts]
+        corner_attributes += [corner_bone_weights, corner_bone_indices]
+
+    # weld identical corners into split vertices (first occurrence order)
+    split_corners, index_buffer = weld_corners(corner_attributes, tolerance)
+
+    geometry = processedGeometry()
+    geometry.vertices = corners.positions[split_corners]
+    geometry.normals = corners.normals[split_corners]
+    geometry.uvs = corners.uvs[split_corners]
+    geometry.indices = index_buffer
+    geometry.bone_weights = None
+    geometry.bone_indices = None
+
+    if raw.skin is not None:
+        geometry.bone_weights = corner_bone_weights[split_corners]
+        geometry.bone_indices = corner_bone_indices[split_corners]
+
+    return geometry
+
+## Element types of the TRACER binary format ('i' and 'f' of struct on the little-endian hosts TRACER runs on)
+INT32   = np.dtype('<i4')
+FLOAT32 = np.dtype('<f4')
+
+## Fields of the packed byte block of one geometry, in wire order
+#  The arrays are only converted (not copied) if they already have the wire type.
+#  @returns             List of contiguous arrays, to be written back to back by pack_into
+def geometry_fields(vertices, indices, normals, uvs, bone_weights=None, bone_indices=None) -> list[np.ndarray]:
+    def count(n: int) -> np.ndarray:
+        return np.array([n], dtype=INT32)
+
+    vertices = np.ascontiguousarray(vertices, dtype=FLOAT32).reshape(-1, 3)
+    indices  = np.ascontiguousarray(indices,  dtype=INT32).ravel()
+    normals  = np.ascontiguousarray(normals,  dtype=FLOAT32).reshape(-1, 3)
+    uvs      = np.ascontiguousarray(uvs,      dtype=FLOAT32).reshape(-1, 2)
+
+    fields = [count(len(vertices)), vertices, count(len(indices)), indices,
+              count(len(normals)), normals, count(len(uvs)), uvs]
+
+    if bone_weights is not None and len(bone_weights) > 0:
+        bone_weights = np.ascontiguousarray(bone_weights, dtype=FLOAT32).reshape(-1, 4)
+        bone_indices = np.ascontiguousarray(bone_indices, dtype=INT32).reshape(-1, 4)
+        fields += [count(len(bone_weights)), bone_weights, bone_indices]
+    else:
+        fields.append(count(0))
+    return fields
+
+## Total number of bytes of a list of fields (arrays or already packed byte blocks)
+def packed_size(fields) -> int:
+    return sum(field.nbytes if isinstance(field, np.ndarray) else len(field) for field in fields)
+
+## Write fields back to back into a preallocated buffer, without intermediate copies
+#  @param buffer        Writable buffer (e.g. a bytearray) large enough for all fields
+#  @param offset        Byte offset of the first field
+#  @param fields        Arrays (written in their own dtype) or already packed byte blocks
+#  @returns             Byte offset after the last field
+def pack_into(buffer, offset: int, fields) -> int:
+    target = memoryview(buffer).cast('B')
+    for field in fields:
+        if isinstance(field, np.ndarray):
+            field = field.reshape(-1).view(np.uint8)
+        size = len(field)
+        target[offset:offset + size] = field
+        offset += size
+    return offset
@@ -0,0 +1,188 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import numpy as np
+
+## Evaluation of animated parameters at arbitrary times, without Blender
+#  Works directly on the key columns of a KeyList (see KeyList.get_columns), so it can be
+#  used for preview playback and resampling. This module does not import AbstractParameter
+#  (which depends on bpy), the key and parameter types below mirror KeyType and TRACERParamType.
+
+STEP        = 1     # KeyType.STEP
+LINEAR      = 2     # KeyType.LINEAR
+BEZIER      = 3     # KeyType.BEZIER
+
+BOOL        = 2     # TRACERParamType.BOOL
+INT         = 3     # TRACERParamType.INT
+QUATERNION  = 8     # TRACERParamType.QUATERNION
+
+# Iterations used to invert the time curve of bezier segments
+BEZIER_ITERATIONS = 8
+
+## Sample an animated parameter
+#  @param parameter     Animated Parameter
+#  @param times         Sample times (frames)
+#  @returns             (samples, fields) array in the layout of the value columns of the parameter
+def evaluate_parameter(parameter, times) -> np.ndarray:
+    return evaluate_columns(parameter.key_list.get_columns(), parameter.get_tracer_type(), times)
+
+## Sample many animated parameters at the same times
+#  Parameters of the same type whose keys share times, key types and tangent times are evaluated together.
+#  @returns     One (samples, fields) array per parameter, in the order of parameters
+def evaluate_parameters(parameters: list, times) -> list[np.ndarray]:
+    groups: dict[tuple, list[int]] = {}
+    for i, parameter in enumerate(parameters):
+        columns = parameter.key_list.get_columns()
+        signature = (parameter.get_tracer_type(), columns['time'].tobytes(), columns['type'].tobytes(),
+                     columns['right_tangent_time'].tobytes(), columns['left_tangent_time'].tobytes())
+        groups.setdefault(signature, []).append(i)
+
+    results = [None] * len(parameters)
+    for (param_type, *_), members in groups.items():
+        columns = [parameters[i].key_list.get_columns() for i in members]
+        stacked = {name: np.stack([c[name] for c in columns]) for name in ('value', 'right_tangent_value', 'left_tangent_value')}
+        for name in ('time', 'type', 'right_tangent_time', 'left_tangent_time'):
+            stacked[name] = columns[0][name]
+        samples = evaluate_stacked(stacked, param_type, times)
+        for i, result in zip(members, samples):
+            results[i] = result
+    return results
+
+## Sample the keys of one parameter
+#  @param columns       Key columns, see KeyList.get_columns
+#  @param param_type    TRACER type of the parameter
+def evaluate_columns(columns: dict[str, np.ndarray], param_type: int, times) -> np.ndarray:
+    stacked = dict(columns)
+    for name in ('value', 'right_tangent_value', 'left_tangent_value'):
+        stacked[name] = columns[name][np.newaxis]
+    return evaluate_stacked(stacked, param_type, times)[0]
+
+## Sample the keys of several parameters sharing key times, key types and tangent times
+#  The value columns have shape (parameters, keys, fields).
+#  Outside of the keys the first and the last value are held. The type of a key defines the
+#  interpolation up to the next key: STEP holds the value, LINEAR interpolates linearly (slerp for
+#  quaternions), BEZIER follows the cubic bezier through the right tangent of the key and the left
+#  tangent of the next key, in time and in value.
+#  @returns     (parameters, samples, fields) array, with the dtype of the value columns
+def evaluate_stacked(columns: dict[str, np.ndarray], param_type: int, times) -> np.ndarray:
+    values = columns['value']
+    times = np.asarray(times, dtype=np.float64).reshape(-1)
+    n_params, n_keys, n_fields = values.shape
+    if n_keys == 0:
+        raise ValueError("Can not evaluate a parameter without keys")
+    if n_keys == 1:
+        return np.repeat(values[:, :1], len(times), axis=1)
+
+    key_times = columns['time'].astype(np.float64)
+    segment = np.clip(np.searchsorted(key_times, times, side='right') - 1, 0, n_keys - 2)
+    t0 = key_times[segment]
+    t1 = key_times[segment + 1]
+    duration = t1 - t0
+    u = np.clip(np.divide(times - t0, duration, out=np.ones_like(times), where=duration > 0), 0.0, 1.0)
+    key_type = columns['type'][segment]
+
+    v0 = values[:, segment].astype(np.float64)
+    v1 = values[:, segment + 1].astype(np.float64)
+
+    # STEP holds the key value up to the next key, BOOL and INT parameters can only step
+    step = (key_type == STEP) | (param_type in (BOOL, INT))
+    u = np.where(step & (times < key_times[-1]), 0.0, u)
+
+    if param_type == QUATERNION:
+        result = slerp(v0, v1, u)
+    else:
+        result = v0 + (v1 - v0) * u[np.newaxis, :, np.newaxis]
+
+    bezier = (key_type == BEZIER) & ~step
+    if np.any(bezier):
+        index = np.flatnonzero(bezier)
+        s = segment[index]
+        # keep the time tangents inside the segment, so the time curve stays monotonic
+        p1 = np.clip(columns['right_tangent_time'][s].astype(np.float64), t0[index], t1[index])
+        p2 = np.clip(columns['left_tangent_time'][s + 1].astype(np.float64), t0[index], t1[index])
+        w = solve_bezier(t0[index], p1, p2, t1[index], times[index], u[index])
+        c1 = columns['right_tangent_value'][:, s].astype(np.float64)
+        c2 = columns['left_tangent_value'][:, s + 1].astype(np.float64)
+        curve = cubic_bezier(v0[:, index], c1, c2, v1[:, index], w[np.newaxis, :, np.newaxis])
+        if param_type == QUATERNION:
+            curve /= np.maximum(np.linalg.norm(curve, axis=-1, keepdims=True), 1e-12)
+        result[:, index] = curve
+
+    if values.dtype.kind in 'biu':
+        return np.rint(result).astype(values.dtype) if values.dtype.kind != 'b' else result > 0.5
+    return result.astype(values.dtype)
+
+def cubic_bezier(p0, p1, p2, p3, u):
+    v = 1.0 - u
+    return v*v*v*p0 + 3.0*v*v*u*p1 + 3.0*v*u*u*p2 + u*u*u*p3
+
+## Find the curve parameter of a monotonic cubic bezier in time for every sample time
+#  Newton steps, falling back to bisection when a step leaves the bracket.
+#  @param guess     Starting parameter (the linear parameter of the sample in the segment)
+def solve_bezier(p0, p1, p2, p3, times, guess) -> np.ndarray:
+    u = guess.copy()
+    low = np.zeros_like(u)
+    high = np.ones_like(u)
+    for _ in range(BEZIER_ITERATIONS):
+        error = cubic_bezier(p0, p1, p2, p3, u) - times
+        low = np.where(error < 0, u, low)
+        high = np.where(error > 0, u, high)
+        v = 1.0 - u
+        slope = 3.0*v*v*(p1 - p0) + 6.0*v*u*(p2 - p1) + 3.0*u*u*(p3 - p2)
+        step = np.divide(error, slope, out=np.zeros_like(u), where=np.abs(slope) > 1e-12)
+        u_next = u - step
+        u = np.where((u_next > low) & (u_next < high), u_next, 0.5 * (low + high))
+    return u
+
+## Spherical linear interpolation of quaternions along the shortest path
+#  @param q0, q1    (parameters, samples, 4) quaternions, in any component order
+#  @param u         (samples,) interpolation factors
+def slerp(q0: np.ndarray, q1: np.ndarray, u: np.ndarray) -> np.ndarray:
+    q0 = q0 / np.maximum(np.linalg.norm(q0, axis=-1, keepdims=True), 1e-12)
+    q1 = q1 / np.maximum(np.linalg.norm(q1, axis=-1, keepdims=True), 1e-12)
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0.0, -q1, q1)
+    dot = np.abs(dot)
+    u = u[np.newaxis, :, np.newaxis]
+
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_theta = np.sin(theta)
+    # nearly parallel quaternions are interpolated linearly, the slerp weights are unstable there
+    linear = sin_theta < 1e-6
+    safe_sin = np.where(linear, 1.0, sin_theta)
+    w0 = np.where(linear, 1.0 - u, np.sin((1.0 - u) * theta) / safe_sin)
+    w1 = np.where(linear, u, np.sin(u * theta) / safe_sin)
+    result = w0 * q0 + w1 * q1
+    return result / np.maximum(np.linalg.norm(result, axis=-1, keepdims=True), 1e-12)
@@ -0,0 +1,102 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import struct
+
+## Precompiled layouts of the TRACER messages (all little endian, no padding)
+#  Every message starts with HEADER, followed by a message type specific body.
+HEADER          = struct.Struct('<BBB')     # client ID, sync time, message type
+RECORD_HEADER   = struct.Struct('<BHHBI')   # scene ID, object ID, parameter ID, parameter type, record length (including this header)
+LOCK_BODY       = struct.Struct('<BHB')     # scene ID, object ID, lock state
+
+LOCK_SIZE = HEADER.size + LOCK_BODY.size
+
+# Reusable buffers of the fixed size messages (only used on Blender's main thread)
+_header_buffer = bytearray(HEADER.size)
+_lock_buffer = bytearray(LOCK_SIZE)
+
+############################
+###  Encoding (sending)  ###
+############################
+
+## Header of a message
+def encode_header(client_id: int, time: int, msg_type: int) -> bytes:
+    HEADER.pack_into(_header_buffer, 0, client_id, time, msg_type)
+    return bytes(_header_buffer)
+
+## One parameter record (PARAMETERUPDATE and RPC messages carry one or more of them after the header)
+#  @param length    Record length announced in the record header (10 + size of the parameter)
+#  @param payload   Serialized parameter data
+def encode_record(scene_id: int, object_id: int, parameter_id: int, parameter_type: int, length: int, payload) -> bytes:
+    record = bytearray(RECORD_HEADER.size + len(payload))
+    RECORD_HEADER.pack_into(record, 0, scene_id, object_id, parameter_id, parameter_type, length)
+    record[RECORD_HEADER.size:] = payload
+    return bytes(record)
+
+## Complete message with a single parameter record
+def encode_record_message(client_id: int, time: int, msg_type: int, scene_id: int, object_id: int,
+                          parameter_id: int, parameter_type: int, length: int, payload) -> bytes:
+    message = bytearray(HEADER.size + RECORD_HEADER.size + len(payload))
+    HEADER.pack_into(message, 0, client_id, time, msg_type)
+    RECORD_HEADER.pack_into(message, HEADER.size, scene_id, object_id, parameter_id, parameter_type, length)
+    message[HEADER.size + RECORD_HEADER.size:] = payload
+    return bytes(message)
+
+## LOCK message
+def encode_lock(client_id: int, time: int, msg_type: int, scene_id: int, object_id: int, locked: bool) -> bytes:
+    HEADER.pack_into(_lock_buffer, 0, client_id, time, msg_type)
+    LOCK_BODY.pack_into(_lock_buffer, HEADER.size, scene_id, object_id, int(locked))
+    return bytes(_lock_buffer)
+
+##############################
+###  Decoding (receiving)  ###
+##############################
+
+## Decode the header of a received message
+#  @returns     (client ID, sync time, message type)
+def decode_header(msg) -> tuple[int, int, int]:
+    return HEADER.unpack_from(msg, 0)
+
+## Decode the parameter record starting at offset, without copying the payload
+#  @param view      memoryview of the received message
+#  @returns         (scene ID, object ID, parameter ID, parameter type, length, payload view)
+def decode_record(view: memoryview, offset: int) -> tuple:
+    scene_id, object_id, parameter_id, parameter_type, length = RECORD_HEADER.unpack_from(view, offset)
+    return scene_id, object_id, parameter_id, parameter_type, length, view[offset + RECORD_HEADER.size : offset + length]
+
+## Decode the body of a LOCK message starting at offset
+#  @returns     (scene ID, object ID, lock state)
+def decode_lock(msg, offset: int) -> tuple[int, int, int]:
+    return LOCK_BODY.unpack_from(msg, offset)
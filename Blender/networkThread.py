@@ -0,0 +1,192 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import queue
+import threading
+
+from .distributionServer import DistributionServer
+from .messageCodec import decode_header
+
+## Message received by the subscriber socket, with its header decoded on the I/O thread
+#   0   - clientID  - byte
+#   1   - time      - byte
+#   2   - msgType   - byte
+#   3+  - msgBody
+class inboundMessage:
+    __slots__ = ("client_id", "time", "type", "data")
+
+    def __init__(self, data: bytes):
+        self.client_id, self.time, self.type = decode_header(data)
+        self.data = data
+
+## Dedicated thread owning all ZMQ sockets of the plugin
+#  The thread serves scene requests (ROUTER), receives updates (SUB) and sends updates (PUB).
+#  It exchanges messages with Blender's main thread only through two bounded queues; when
+#  a queue is full the oldest message is dropped and counted, so neither side ever blocks.
+#  Only the main thread touches bpy: it hands over new scene data with set_scene, queues
+#  outgoing messages with send and applies received messages taken with receive.
+class NetworkThread(threading.Thread):
+    POLL_TIMEOUT_MS = 2     # upper bound of the latency of outgoing messages
+
+    def __init__(self, server_ip: str, dist_port: str, sync_port: str, update_port: str, queue_size: int = 4096):
+        super().__init__(name="TRACER Network", daemon=True)
+        self.server_ip = server_ip
+        self.dist_port = dist_port
+        self.sync_port = sync_port
+        self.update_port = update_port
+
+        self.inbound: queue.Queue[inboundMessage] = queue.Queue(queue_size)
+        self.outbound: queue.Queue[bytes] = queue.Queue(queue_size)
+        self.dropped_inbound = 0
+        self.dropped_outbound = 0
+        self.error: Exception = None
+
+        # per-tick processing time of the main thread (set by the listener)
+        self.tick_time = 0.0
+        self.max_tick_time = 0.0
+        # statistics of the scene distribution (set by the I/O thread, see distributionServer.stats)
+        self.served: dict[str, int] = {"clients": 0, "requests": 0}
+
+        self.__scene: dict[str, bytes] = {}
+        self.__ready = threading.Event()
+        self.__stop = threading.Event()
+
+    ## Start the thread and wait until the sockets are set up
+    #  Raises the exception of the I/O thread if a socket could not be created or bound
+    def start(self):
+        super().start()
+        self.__ready.wait()
+        if self.error != None:
+            raise self.error
+
+    def stop(self):
+        self.__stop.set()
+        if self.is_alive():
+            self.join()
+
+    ## Hand over new scene data (called on the main thread after gathering the scene)
+    #  The data is copied once, so the main thread can keep modifying its buffers.
+    #  Clients already connected have to request the new scene again.
+    def set_scene(self, payloads: dict):
+        self.__scene = {request: bytes(data) for request, data in payloads.items()}
+
+    ## Queue a message for the publisher socket
+    def send(self, msg):
+        self.__put(self.outbound, bytes(msg), 'dropped_outbound')
+
+    ## Take the next received message, or None if there is none
+    def receive(self) -> inboundMessage | None:
+        try:
+            return self.inbound.get_nowait()
+        except queue.Empty:
+            return None
+
+    def record_tick(self, seconds: float):
+        self.tick_time = seconds
+        self.max_tick_time = max(self.max_tick_time, seconds)
+
+    def stats(self) -> dict:
+        return {"inbound": self.inbound.qsize(), "outbound": self.outbound.qsize(),
+                "dropped_inbound": self.dropped_inbound, "dropped_outbound": self.dropped_outbound,
+                "tick_ms": round(self.tick_time * 1000, 2), "max_tick_ms": round(self.max_tick_time * 1000, 2),
+                "clients": self.served["clients"], "scene_requests": self.served["requests"]}
+
+    def __put(self, target: queue.Queue, item, dropped_counter: str):
+        while True:
+            try:
+                target.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    target.get_nowait()
+                    setattr(self, dropped_counter, getattr(self, dropped_counter) + 1)
+                except queue.Empty:
+                    pass
+
+    def run(self):
+        try:
+            import zmq
+            context = zmq.Context()
+            subscriber = context.socket(zmq.SUB)
+            subscriber.connect(f'tcp://{self.server_ip}:{self.sync_port}')
+            subscriber.setsockopt_string(zmq.SUBSCRIBE, "")
+
+            router = context.socket(zmq.ROUTER)
+            router.bind(f'tcp://{self.server_ip}:{self.dist_port}')
+            distributor = DistributionServer(router)
+
+            publisher = context.socket(zmq.PUB)
+            publisher.connect(f'tcp://{self.server_ip}:{self.update_port}')
+
+            poller = zmq.Poller()
+            poller.register(subscriber, zmq.POLLIN)
+            poller.register(router, zmq.POLLIN)
+        except Exception as e:
+            self.error = e
+            self.__ready.set()
+            if 'context' in locals():
+                context.destroy(linger=0)
+            return
+        self.__ready.set()
+
+        scene = self.__scene
+        while not self.__stop.is_set():
+            events = dict(poller.poll(NetworkThread.POLL_TIMEOUT_MS))
+
+            if self.__scene is not scene:
+                scene = self.__scene
+                distributor.reset_clients()
+                self.served = distributor.stats()
+
+            if router in events:
+                if distributor.serve(scene) > 0:
+                    self.served = distributor.stats()
+
+            if subscriber in events:
+                while True:
+                    try:
+                        msg = subscriber.recv(zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+                    if len(msg) >= 3:
+                        self.__put(self.inbound, inboundMessage(msg), 'dropped_inbound')
+
+            while True:
+                try:
+                    publisher.send(self.outbound.get_nowait())
+                except queue.Empty:
+                    break
+
+        context.destroy(linger=0)
@@ -0,0 +1,164 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import numpy as np
+
+## Batched forward kinematics of the TRACER character rig
+#  Computes the matrix_basis of every bone for many frames at once, with the math of
+#  SceneObjectCharacter.update_bone_rotation / set_pose_matrices:
+#     rotation[bone]  = rotation[parent] @ Translation(rest translation of bone) @ quaternion matrix
+#     local[bone]     = Translation(location offset) @ rotation[bone]
+#     matrix_basis    = Bone.convert_local_to_pose(local, matrix_local, parent rotation, parent matrix_local, invert=True)
+#  convert_local_to_pose is evaluated in closed form, which is only valid for bones that inherit
+#  rotation and scale fully and use local location (the defaults, see is_supported).
+#  All matrices are float64 NumPy arrays, quaternions are in the order WXYZ.
+class PoseSolver:
+    bone_names:         list[str]   # bones in topological order (parents before children)
+    parents:            np.ndarray  # (n_bones,) index of the parent bone, -1 for roots
+    rest_translations:  np.ndarray  # (n_bones, 3) translation of the rest transform of each bone relative to its parent
+    rest_offsets:       np.ndarray  # (n_bones, 4, 4) matrix_local of the bone relative to the matrix_local of its parent
+    levels:             list[np.ndarray]    # bone indices grouped by depth in the hierarchy
+
+    ## @param bones                     Bones of the armature (bpy.types.Bone), in any order
+    #  @param local_rest_transforms     Bone name -> rest transform relative to the parent (SceneObjectCharacter.local_bone_rest_transform)
+    def __init__(self, bones, local_rest_transforms: dict):
+        by_name = {bone.name: bone for bone in bones}
+        self.bone_names = []
+        depth: dict[str, int] = {}
+        # parents before children, so that every chain can be accumulated in one pass
+        pending = [bone for bone in bones if bone.parent == None]
+        while pending:
+            bone = pending.pop(0)
+            self.bone_names.append(bone.name)
+            depth[bone.name] = depth[bone.parent.name] + 1 if bone.parent else 0
+            pending.extend(bone.children)
+        index = {name: i for i, name in enumerate(self.bone_names)}
+
+        self.parents = np.array([index[by_name[name].parent.name] if by_name[name].parent else -1 for name in self.bone_names], dtype=np.int64)
+        self.rest_translations = np.array([local_rest_transforms[name].to_translation() for name in self.bone_names], dtype=np.float64).reshape(-1, 3)
+        matrix_local = np.array([by_name[name].matrix_local for name in self.bone_names], dtype=np.float64).reshape(-1, 4, 4)
+        self.rest_offsets = matrix_local.copy()
+        has_parent = self.parents >= 0
+        self.rest_offsets[has_parent] = np.linalg.inv(matrix_local[self.parents[has_parent]]) @ matrix_local[has_parent]
+        self.levels = [np.array([index[name] for name in self.bone_names if depth[name] == d], dtype=np.int64)
+                       for d in range(max(depth.values(), default=-1) + 1)]
+        self.is_supported = all(PoseSolver.supports(by_name[name]) for name in self.bone_names)
+
+    def __len__(self) -> int:
+        return len(self.bone_names)
+
+    ## Whether the closed form of convert_local_to_pose is valid for the bone
+    @staticmethod
+    def supports(bone) -> bool:
+        return bone.use_inherit_rotation and bone.inherit_scale == 'FULL' and bone.use_local_location
+
+    ## Compute the matrix_basis of all bones for all frames
+    #  @param rotations     (n_bones, n_frames, 4) rotation of every bone (WXYZ), in the order of bone_names
+    #  @param translations  (n_bones, n_frames, 3) location offset of every bone (zero for bones that are not displaced)
+    #  @returns             (n_bones, n_frames, 4, 4) matrix_basis of every bone
+    def solve(self, rotations: np.ndarray, translations: np.ndarray) -> np.ndarray:
+        n_bones, n_frames = rotations.shape[:2]
+        local = quaternion_to_matrix(rotations)
+        local[..., :3, 3] = self.rest_translations[:, np.newaxis]
+
+        # accumulate the rotation chains level by level (all bones of a level at once)
+        chains = np.empty_like(local)
+        for level in self.levels:
+            parents = self.parents[level]
+            roots = parents < 0
+            chains[level[roots]] = local[level[roots]]
+            children = level[~roots]
+            chains[children] = chains[parents[~roots]] @ local[children]
+
+        displaced = translation_matrix(translations) @ chains
+
+        # pose space of the parent: parent chain @ (parent matrix_local^-1 @ matrix_local), the rest matrix for roots
+        has_parent = self.parents >= 0
+        parent_space = np.broadcast_to(self.rest_offsets[:, np.newaxis], (n_bones, n_frames, 4, 4)).copy()
+        parent_space[has_parent] = chains[self.parents[has_parent]] @ self.rest_offsets[has_parent, np.newaxis]
+        return np.linalg.solve(parent_space, displaced)
+
+## (..., 4) WXYZ quaternions -> (..., 4, 4) rotation matrices (like Quaternion.to_matrix, without normalizing)
+def quaternion_to_matrix(q: np.ndarray) -> np.ndarray:
+    w, x, y, z = np.moveaxis(np.asarray(q, dtype=np.float64), -1, 0)
+    m = np.zeros(q.shape[:-1] + (4, 4))
+    m[..., 0, 0] = 1.0 - 2.0*(y*y + z*z)
+    m[..., 0, 1] = 2.0*(x*y - w*z)
+    m[..., 0, 2] = 2.0*(x*z + w*y)
+    m[..., 1, 0] = 2.0*(x*y + w*z)
+    m[..., 1, 1] = 1.0 - 2.0*(x*x + z*z)
+    m[..., 1, 2] = 2.0*(y*z - w*x)
+    m[..., 2, 0] = 2.0*(x*z - w*y)
+    m[..., 2, 1] = 2.0*(y*z + w*x)
+    m[..., 2, 2] = 1.0 - 2.0*(x*x + y*y)
+    m[..., 3, 3] = 1.0
+    return m
+
+## (..., 3) translations -> (..., 4, 4) translation matrices
+def translation_matrix(t: np.ndarray) -> np.ndarray:
+    m = np.zeros(t.shape[:-1] + (4, 4))
+    m[..., [0, 1, 2, 3], [0, 1, 2, 3]] = 1.0
+    m[..., :3, 3] = t
+    return m
+
+## Split (..., 4, 4) matrices into location and rotation, like Matrix.decompose
+#  Negative scales are folded into the rotation like Blender does, quaternions are returned with W >= 0.
+#  @returns     (..., 3) locations, (..., 4) WXYZ quaternions
+def decompose(m: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    location = m[..., :3, 3].copy()
+    rotation = m[..., :3, :3] / np.maximum(np.linalg.norm(m[..., :3, :3], axis=-2, keepdims=True), 1e-12)
+    negative = np.linalg.det(rotation) < 0
+    rotation[negative] *= -1.0
+    return location, matrix_to_quaternion(rotation)
+
+## (..., 3, 3) orthonormal matrices -> (..., 4) WXYZ quaternions with W >= 0
+def matrix_to_quaternion(r: np.ndarray) -> np.ndarray:
+    m00, m11, m22 = r[..., 0, 0], r[..., 1, 1], r[..., 2, 2]
+    # pick the largest of w, x, y, z to divide by (Shepperd's method)
+    candidates = np.stack([1.0 + m00 + m11 + m22, 1.0 + m00 - m11 - m22, 1.0 - m00 + m11 - m22, 1.0 - m00 - m11 + m22], axis=-1)
+    largest = np.argmax(candidates, axis=-1)
+    s = 2.0 * np.sqrt(np.maximum(np.take_along_axis(candidates, largest[..., np.newaxis], axis=-1)[..., 0], 1e-12))
+    q = np.empty(r.shape[:-2] + (4,))
+    variants = (
+        (0.25 * s, (r[..., 2, 1] - r[..., 1, 2]) / s, (r[..., 0, 2] - r[..., 2, 0]) / s, (r[..., 1, 0] - r[..., 0, 1]) / s),
+        ((r[..., 2, 1] - r[..., 1, 2]) / s, 0.25 * s, (r[..., 0, 1] + r[..., 1, 0]) / s, (r[..., 0, 2] + r[..., 2, 0]) / s),
+        ((r[..., 0, 2] - r[..., 2, 0]) / s, (r[..., 0, 1] + r[..., 1, 0]) / s, 0.25 * s, (r[..., 1, 2] + r[..., 2, 1]) / s),
+        ((r[..., 1, 0] - r[..., 0, 1]) / s, (r[..., 0, 2] + r[..., 2, 0]) / s, (r[..., 1, 2] + r[..., 2, 1]) / s, 0.25 * s),
+    )
+    for i, variant in enumerate(variants):
+        selected = largest == i
+        q[selected] = np.stack(variant, axis=-1)[selected]
+    q[q[..., 0] < 0] *= -1.0
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
@@ -0,0 +1,121 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import numpy as np
+
+## Buffer of the poses streamed by AnimHost for one character
+#  Holds the location and rotation channels (in pose space, see SceneObjectCharacter.bake_animation)
+#  of all frames of the stream, until the stream ends or starts over. The buffer doubles its capacity
+#  when it is full, so no frame is lost and the cost of a streamed frame does not depend on how long
+#  the stream has been running (amortized).
+#  Bones that are not part of a pushed block keep the value of their previous frame.
+class PoseStream:
+    bone_names: list[str]   # bones of the buffer, index of the first axis of locations and rotations
+    frames:     np.ndarray  # (capacity,) frames of the slots
+    locations:  np.ndarray  # (n_bones, capacity, 3) location channels of the slots
+    rotations:  np.ndarray  # (n_bones, capacity, 4) rotation channels (WXYZ) of the slots
+
+    ## @param bone_names    Names of the bones of the character
+    #  @param capacity      Number of frames the buffer holds before it grows
+    def __init__(self, bone_names: list[str], capacity: int = 1024):
+        self.bone_names = list(bone_names)
+        self.bone_index = {bone_name: i for i, bone_name in enumerate(self.bone_names)}
+        self.streamed = np.zeros(len(self.bone_names), dtype=bool)    # bones that were part of a pushed block
+        self.count = 0      # number of valid slots, the newest frame is in slot count - 1
+        self.__allocate(capacity)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __allocate(self, capacity: int):
+        frames = np.zeros(capacity, dtype=np.float32)
+        locations = np.zeros((len(self.bone_names), capacity, 3), dtype=np.float32)
+        rotations = np.zeros((len(self.bone_names), capacity, 4), dtype=np.float32)
+        rotations[..., 0] = 1
+        if self.count > 0:
+            frames[:self.count] = self.frames[:self.count]
+            locations[:, :self.count] = self.locations[:, :self.count]
+            rotations[:, :self.count] = self.rotations[:, :self.count]
+        self.capacity = capacity
+        self.frames, self.locations, self.rotations = frames, locations, rotations
+
+    def clear(self):
+        self.count = 0
+        self.streamed[:] = False
+
+    ## Frame of the newest pose, None if the buffer is empty
+    def last_frame(self) -> float:
+        if self.count == 0:
+            return None
+        return float(self.frames[self.count - 1])
+
+    ## Append a block of frames
+    #  @param frames    (n,) frames, after last_frame
+    #  @param channels  Bone name -> (frames, locations, rotations (WXYZ)) at those frames, see SceneObjectCharacter.bake_animation
+    def push(self, frames: np.ndarray, channels: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]):
+        n = len(frames)
+        if n == 0:
+            return
+        if self.count + n > self.capacity:
+            self.__allocate(max(2 * self.capacity, self.count + n))
+        slots = slice(self.count, self.count + n)
+
+        # carry the previous pose of all bones over, then overwrite the channels of the block
+        if self.count > 0:
+            previous = self.count - 1
+            self.locations[:, slots] = self.locations[:, previous, np.newaxis]
+            self.rotations[:, slots] = self.rotations[:, previous, np.newaxis]
+        self.frames[slots] = frames
+        for bone_name, (bone_frames, locations, rotations) in channels.items():
+            i = self.bone_index.get(bone_name)
+            if i != None:
+                self.locations[i, slots] = locations
+                self.rotations[i, slots] = rotations
+                self.streamed[i] = True
+
+        self.count += n
+
+    ## The newest pose
+    #  @returns     (frame, locations (n_bones, 3), rotations (n_bones, 4)), views into the buffer
+    def latest(self) -> tuple[float, np.ndarray, np.ndarray]:
+        previous = self.count - 1
+        return float(self.frames[previous]), self.locations[:, previous], self.rotations[:, previous]
+
+    ## The buffered frames from the oldest to the newest, as channels of the streamed bones
+    #  @returns     Bone name -> (frames, locations, rotations (WXYZ)), like SceneObjectCharacter.bake_animation
+    def get_channels(self) -> dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        frames = self.frames[:self.count]
+        return {bone_name: (frames, self.locations[i, :self.count], self.rotations[i, :self.count])
+                for bone_name, i in self.bone_index.items() if self.streamed[i]}
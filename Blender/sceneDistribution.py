@@ -36,13 +36,20 @@ individual license agreement.
 import bpy
 import math
 import mathutils
-import bmesh
 import struct
 import re
+import os
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
 
 from mathutils import Vector, Quaternion
 from.settings import TracerData, TracerProperties
 from .AbstractParameter import Parameter
+from .geoProcessing import read_mesh_data, content_hash, process_geometry, geometry_fields, packed_size, pack_into, INT32, FLOAT32
+from .geoCache import GeoCache
+from .textureStore import TextureStore, TextureCache, file_stamp, read_texture
+from .textureProcessing import image_pixels, cap_resolution, to_uint8, encode_texture_block
 from .SceneObjects.SceneObject import SceneObject, NodeTypes
 from .SceneObjects.SceneObjectMesh import SceneObjectMesh
 from .SceneObjects.SceneObjectCamera import SceneObjectCamera
@@ -99,6 +106,12 @@ def clear_tracer_data():
     tracer_data.characterList.clear()
     tracer_data.curveList.clear()
     tracer_data.editable_objects.clear()
+    tracer_data.objectIndex.clear()
+    tracer_data.childCounts.clear()
+    tracer_data.geoIndex.clear()
+    tracer_data.geoHashIndex.clear()
+    tracer_data.materialIndex.clear()
+    tracer_data.textureIndex.clear()
     tracer_data.SceneObjects.clear()
     
     tracer_data.nodesByteData.clear()
@@ -115,13 +128,25 @@ def gather_scene_data():
     SceneObject.start_id = 1
     clear_tracer_data()
     tracer_data.cID = int(str(tracer_props.server_ip).split('.')[3])
+    open_geo_cache()
+    open_texture_cache()
+    if tracer_data.textureStore == None:
+        tracer_data.textureStore = TextureStore()
+    tracer_data.textureStore.reset_stats()
     object_list = get_object_list()
 
     if len(object_list) > 0:
         tracer_data.objectsToTransfer = object_list
+        index_objects_to_transfer()
         #iterate over all objects in the scene
-        for i, obj in enumerate(tracer_data.objectsToTransfer):
-            process_scene_object(obj, i)
+        open_worker_pool()
+        try:
+            for i, obj in enumerate(tracer_data.objectsToTransfer):
+                process_scene_object(obj, i)
+            finish_geometry()
+            finish_textures()
+        finally:
+            close_worker_pool()
 
         for i, obj in enumerate(tracer_data.objectsToTransfer):
             process_editable_objects(obj, i)
@@ -140,6 +165,68 @@ def gather_scene_data():
         return 0
     
 
+## Directory of the persistent caches, the texture cache is kept in its subdirectory "textures"
+def cache_directory() -> str:
+    if tracer_props.geo_cache_dir != '':
+        return bpy.path.abspath(tracer_props.geo_cache_dir)
+    return bpy.utils.user_resource('DATAFILES', path="tracer_geo_cache", create=True)
+
+## Open (or re-open if the settings changed) the persistent geometry cache
+#  tracer_data.geoCache is None if the cache is disabled
+def open_geo_cache():
+    if not tracer_props.use_geo_cache:
+        tracer_data.geoCache = None
+        return
+
+    directory = cache_directory()
+    max_bytes = tracer_props.geo_cache_size * 1024 * 1024
+
+    if tracer_data.geoCache == None or tracer_data.geoCache.directory != directory:
+        tracer_data.geoCache = GeoCache(directory, max_bytes)
+    else:
+        tracer_data.geoCache.max_bytes = max_bytes
+    tracer_data.geoCache.reset_stats()
+
+## Open (or re-open if the settings changed) the persistent cache of downsampled textures
+#  tracer_data.textureCache is None if the cache is disabled or textures are not downsampled
+def open_texture_cache():
+    if not tracer_props.use_texture_cache or tracer_props.texture_max_size <= 0:
+        tracer_data.textureCache = None
+        return
+
+    texture_directory = os.path.join(cache_directory(), "textures")
+    texture_max_bytes = tracer_props.texture_cache_size * 1024 * 1024
+    if tracer_data.textureCache == None or tracer_data.textureCache.directory != texture_directory:
+        tracer_data.textureCache = TextureCache(texture_directory, texture_max_bytes)
+    else:
+        tracer_data.textureCache.max_bytes = texture_max_bytes
+    tracer_data.textureCache.reset_stats()
+
+## Map the name of every object to transfer to its index (first occurrence wins, as the former linear scans)
+#  Bones, skinned meshes and characters look up their scene ids here instead of scanning objectsToTransfer
+#  The child counts are collected here too, Object.children scans all objects of the file on every access
+def index_objects_to_transfer():
+    tracer_data.objectIndex.clear()
+    tracer_data.childCounts.clear()
+    for i, obj in enumerate(tracer_data.objectsToTransfer):
+        tracer_data.objectIndex.setdefault(obj.name, i)
+        if obj.parent != None:
+            tracer_data.childCounts[obj.parent.name] = tracer_data.childCounts.get(obj.parent.name, 0) + 1
+
+## Start the worker threads processing geometry and reading textures while the main thread reads the scene
+#  tracer_data.workerPool is None if everything is processed serially on the main thread
+def open_worker_pool():
+    workers = tracer_props.worker_count if tracer_props.worker_count > 0 else (os.cpu_count() or 1)
+    if workers > 1:
+        tracer_data.workerPool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TRACER Worker")
+    else:
+        tracer_data.workerPool = None
+
+def close_worker_pool():
+    if tracer_data.workerPool != None:
+        tracer_data.workerPool.shutdown(wait=True, cancel_futures=True)
+        tracer_data.workerPool = None
+
 def get_object_list() -> list[bpy.types.Object]:
     parent_object_name = "TRACER Scene Root"
     parent_object: bpy.types.Object = bpy.data.objects.get(parent_object_name)
@@ -225,7 +312,7 @@ def process_scene_object(obj: bpy.types.Object, index):
     
     for i, n in enumerate(obj.name.encode()):
         node.name[i] = n
-    node.childCount = len(obj.children)
+    node.childCount = tracer_data.childCounts.get(obj.name, 0)
     
     # Assign the child count of the root object
     if obj.name == 'TRACER Scene Root':
@@ -272,7 +359,7 @@ def process_skinned_mesh(obj, nodeSkinMesh):
     nodeSkinMesh.color = (0,0,0,1)
     nodeSkinMesh.roughness = 0.5
     nodeSkinMesh.materialId = -1
-    nodeSkinMesh.characterRootID = tracer_data.objectsToTransfer.index(obj.parent)
+    nodeSkinMesh.characterRootID = tracer_data.objectIndex[obj.parent.name]
     
     nodeSkinMesh.geoID = processGeoNew(obj)
     # get material of mesh
@@ -311,13 +398,7 @@ def process_skinned_mesh(obj, nodeSkinMesh):
             nodeSkinMesh.bindPoseLength = int(len(bind_poses) / 16)
             nodeSkinMesh.skinnedMeshBoneIDs = [-1] * 99  # Initialize all to -1
             for i, bone in enumerate(armature_data.bones):
-                bone_index = -1
-                for idx, obj in enumerate(tracer_data.objectsToTransfer):
-                    if obj.name == bone.name:
-                        bone_index = idx
-                        break
-            #for i, bone in enumerate(armature_data.bones):  
-                nodeSkinMesh.skinnedMeshBoneIDs[i] = bone_index
+                nodeSkinMesh.skinnedMeshBoneIDs[i] = tracer_data.objectIndex.get(bone.name, -1)
                 
 
         nodeSkinMesh.skinnedMeshBoneIDsSize = len(nodeSkinMesh.skinnedMeshBoneIDs)        
@@ -337,7 +418,7 @@ def process_character(armature_obj, object_list):
 
     if armature_obj.type == 'ARMATURE':
         bones = armature_obj.data.bones
-        chr_pack.characterRootID = tracer_data.objectsToTransfer.index(armature_obj)
+        chr_pack.characterRootID = tracer_data.objectIndex[armature_obj.name]
 
         if(tracer_props.humanoid_rig):
             raise RuntimeError("Update Humanoid Rig implementation")
@@ -350,21 +431,12 @@ def process_character(armature_obj, object_list):
                 chr_pack.boneMapping.append(bone_index)
 
         else:
-            for i, bone in enumerate(bones):
-                bone_index = -1
-                for idx, obj in enumerate(tracer_data.objectsToTransfer):
-                    if obj.name == bone.name:
-                        bone_index = idx
-                        break
-
-                chr_pack.boneMapping.append(bone_index)
+            for bone in bones:
+                chr_pack.boneMapping.append(tracer_data.objectIndex.get(bone.name, -1))
         
         chr_pack.bMSize = len(chr_pack.boneMapping)
         
-        for idx, obj in enumerate(object_list):
-                if obj.name == armature_obj.name:
-                    bone_index = idx
-        chr_pack.skeletonMapping.append(bone_index)
+        chr_pack.skeletonMapping.append(chr_pack.characterRootID)
 
         nodeMatrix = armature_obj.matrix_local.copy()
 
@@ -376,10 +448,7 @@ def process_character(armature_obj, object_list):
 
         for mesh in armature_obj.children:
             if mesh.type == 'MESH':
-                for idx, obj in enumerate(object_list):
-                    if obj.name == mesh.name:
-                        bone_index = idx
-                chr_pack.skeletonMapping.append(bone_index)
+                chr_pack.skeletonMapping.append(tracer_data.objectIndex.get(mesh.name, -1))
 
                 nodeMatrix = mesh.matrix_local.copy()
 
@@ -391,13 +460,7 @@ def process_character(armature_obj, object_list):
 
 
         for bone in armature_obj.pose.bones:
-            bone_index = -1
-            for idx, obj in enumerate(object_list):
-                if obj.name == bone.name:
-                    bone_index = idx
-                    break
-
-            chr_pack.skeletonMapping.append(bone_index)
+            chr_pack.skeletonMapping.append(tracer_data.objectIndex.get(bone.name, -1))
 
             
             bone_matrix = armature_obj.matrix_world @ bone.matrix 
@@ -597,10 +660,8 @@ def processMaterial(mesh):
     matPack.textureId = -1
     
     # need to check if the material was already processed
-    for i, n in enumerate(tracer_data.materialList):
-        if n.name == name:
-            return i
-        
+    if name in tracer_data.materialIndex:
+        return tracer_data.materialIndex[name]
 
     matPack.name = bytearray(64)
     matPack.src = bytearray(64)
@@ -649,193 +710,197 @@ def processMaterial(mesh):
             
     matPack.diffuseTexture = matPack.tex
     matPack.materialID = len(tracer_data.materialList)
+    tracer_data.materialIndex[name] = matPack.materialID
     tracer_data.materialList.append(matPack)
     return (len(tracer_data.materialList)-1)
     
 ## Process Texture
+#  The image file is read on the worker pool (or taken from the texture store if it did not
+#  change since the last gather). The returned id is provisional: finish_textures merges
+#  textures with identical content and remaps the material texture ids.
 #
 # @param tex Texture to process
 def processTexture(tex):
     # check if texture is already processed
-    for i, t in enumerate(tracer_data.textureList):
-        if t.texture == tex.name_full:
-            return i
+    if tex.name_full in tracer_data.textureIndex:
+        return tracer_data.textureIndex[tex.name_full]
 
+    path = os.path.abspath(tex.filepath_from_user())
     try:
-        texFile = open(tex.filepath_from_user(), 'rb')
-    except FileNotFoundError:
-        bpy.context.window.modal_operators[-1].report({'ERROR'}, f"Error: Texture file not found at {tex.filepath_from_user()}")
+        stamp = file_stamp(path, tex.size[0], tex.size[1])
+    except OSError:
+        bpy.context.window.modal_operators[-1].report({'ERROR'}, f"Error: Texture file not found at {path}")
         return -1
-    
-    texBytes = texFile.read()
-    
+
     texPack = texturePackage()
-    texPack.colorMapData = texBytes
-    texPack.colorMapDataSize = len(texBytes)
-    texPack.width = tex.size[0]
-    texPack.height = tex.size[1]
-    texPack.format = 0
-    
     texPack.texture = tex.name_full
-    
-    texFile.close()
+    texPack.image = tex
+    texPack.path = path
+    texPack.future = None
+    texPack.entry = tracer_data.textureStore.get(path, stamp)
+
+    if texPack.entry == None:
+        if tracer_data.workerPool != None:
+            texPack.future = tracer_data.workerPool.submit(read_texture, path, stamp)
+        else:
+            texPack.entry = read_texture(path, stamp)
+            tracer_data.textureStore.put(texPack.entry)
 
-    texBinary = bytearray([])
-        
-    #texBinary.extend(struct.pack('i', 0)) #type
-    texBinary.extend(struct.pack('i', texPack.width))
-    texBinary.extend(struct.pack('i', texPack.height))
-    texBinary.extend(struct.pack('i', texPack.format))
-    texBinary.extend(struct.pack('i', texPack.colorMapDataSize))
-    texBinary.extend(texPack.colorMapData)
-    
+    tracer_data.textureIndex[tex.name_full] = len(tracer_data.textureList)
     tracer_data.textureList.append(texPack)
     
-    # return index of texture in texture list
+    # return (provisional) index of texture in texture list
     return (len(tracer_data.textureList)-1)
 
-def get_vertex_bone_weights_and_indices(vert):
-    #for vert_idx, vert in enumerate(obj.data.vertices):
-        # Retrieve the vertex groups and their weights for this vertex
-        groups = [(g.group, g.weight) for g in vert.groups]
-        
-        # Sort the groups by weight in descending order
-        groups.sort(key=lambda x: x[1], reverse=True)
-        
-        # Limit to at most 4 bone influences
-        groups = groups[:4]
-        while len(groups) < 4:
-            groups.append((0, 0.0))
-        
-        # Output the bone indices and weights for this vertex
-        bone_indices = [g[0] for g in groups]
-        bone_weights = [g[1] for g in groups]
-        
-        return bone_weights, bone_indices
+## Choose the texture block to send for every texture, downsampling images larger than the cap
+#  Capped levels are looked up in the texture store and the persistent texture cache first.
+#  Reading the pixels needs bpy and happens on the main thread, PNG encoding on the worker pool.
+#  @param textures  Texture packages with their (source) entries
+#  @param max_size  Maximum texture width and height, 0 sends the original files
+def cap_textures(textures, max_size: int):
+    pending = []
+    for texPack in textures:
+        texPack.byteData = texPack.entry.byteData
+        if max_size <= 0 or max(texPack.entry.width, texPack.entry.height) <= max_size:
+            continue
+
+        key = TextureCache.key(texPack.entry.contentHash, max_size)
+        if max_size not in texPack.entry.levels and tracer_data.textureCache != None:
+            cached = tracer_data.textureCache.get(key)
+            if cached != None:
+                texPack.entry.levels[max_size] = cached
+        if max_size in texPack.entry.levels:
+            texPack.byteData = texPack.entry.levels[max_size]
+            continue
+
+        pixels = to_uint8(cap_resolution(image_pixels(texPack.image), max_size))
+        if tracer_data.workerPool != None:
+            pending.append((texPack, key, tracer_data.workerPool.submit(encode_texture_block, pixels)))
+        else:
+            pending.append((texPack, key, encode_texture_block(pixels)))
+
+    for texPack, key, block in pending:
+        if not isinstance(block, bytes):
+            block = block.result()
+        texPack.entry.levels[max_size] = block
+        texPack.byteData = block
+        if tracer_data.textureCache != None:
+            tracer_data.textureCache.put(key, block)
+
+## Wait for the texture reads, merge textures with identical content and remap the texture ids
+def finish_textures():
+    remap = []
+    unique_textures = []
+    unique_ids = {}     # content hash -> final texture id
+    for texPack in tracer_data.textureList:
+        if texPack.future != None:
+            try:
+                texPack.entry = texPack.future.result()
+                tracer_data.textureStore.put(texPack.entry)
+            except OSError as e:
+                bpy.context.window.modal_operators[-1].report({'ERROR'}, f"Error: Could not read texture file {texPack.path}: {e}")
+                remap.append(-1)
+                continue
+            texPack.future = None
+
+        if texPack.entry.contentHash not in unique_ids:
+            unique_ids[texPack.entry.contentHash] = len(unique_textures)
+            unique_textures.append(texPack)
+        remap.append(unique_ids[texPack.entry.contentHash])
+
+    tracer_data.textureList = unique_textures
+    cap_textures(unique_textures, tracer_props.texture_max_size)
+    for name, textureId in tracer_data.textureIndex.items():
+        tracer_data.textureIndex[name] = remap[textureId]
+    for matPack in tracer_data.materialList:
+        if matPack.textureId != -1:
+            matPack.textureId = remap[matPack.textureId]
+
+    # only keep the files of the current scene in memory
+    tracer_data.textureStore.retain({texPack.path for texPack in unique_textures})
 
 def processGeoNew(mesh):
     geoPack = sceneMesh()
     mesh_identifier = generate_mesh_identifier(mesh)
     geoPack.identifier = mesh_identifier
-    vertex_bone_weights = {}
-    vertex_bone_indices = {}
-    isParentArmature = False
-
-    for existing_geo in tracer_data.geoList:
-        if existing_geo.identifier == mesh_identifier:
-            return tracer_data.geoList.index(existing_geo)
-
-    if mesh.parent != None:
-        if mesh.parent.type == 'ARMATURE':
-            isParentArmature = True
-            armature = mesh.parent
-            bone_names = {bone.name: idx for idx, bone in enumerate(armature.data.bones)}
-            
 
-            for vert in mesh.data.vertices:
-                weights, indices = get_vertex_bone_weights_and_indices(vert)
-                vertex_bone_weights[vert.index] = weights
-                vertex_bone_indices[vert.index] = indices
-
-    #mesh.data.calc_normals_split()
-    bm = bmesh.new()
-    bm.from_mesh(mesh.data)
-
-    # flipping faces because the following axis swap inverts them
-    for f in bm.faces:
-        bmesh.utils.face_flip(f)
-    bm.normal_update()
-
-    bm.verts.ensure_lookup_table()
-    uv_layer = bm.loops.layers.uv.active
-    loop_triangles = bm.calc_loop_triangles()
-
-    split_verts = {} # vertex data : some unique counted index using hash map for quick lookup
-    index_buffer = []
-    split_index_cur = 0 # index of vert after which the hash_map can later be sorted into a list again
-    num_shared_verts = 0 # just for debugging purposes
-    for tri in loop_triangles:
-        for loop in tri:
-            original_index = loop.vert.index
-            co = loop.vert.co.copy().freeze()
-            uv = loop[uv_layer].uv.copy().freeze()
-
-            if mesh.data.polygons[0].use_smooth:
-                normal = loop.vert.normal.copy().freeze() if loop.edge.smooth else loop.face.normal.copy().freeze()
-            else:
-                normal = loop.face.normal.copy().freeze()
-            
-            bone_weights = [0.0] * 4
-            bone_indices = [-1] * 4
-            if mesh.parent != None:
-                if mesh.parent.type == 'ARMATURE':
-                    bone_weights = vertex_bone_weights.get(original_index, [0.0] * 4)
-                    bone_indices = vertex_bone_indices.get(original_index, [-1] * 4)
-
-            #normal = loop.vert.normal.copy().freeze() if loop.edge.smooth else loop.face.normal.copy().freeze()
-            new_split_vert = (co, normal, uv, tuple(bone_weights), tuple(bone_indices))
-            split_vert_idx = split_verts.get(new_split_vert)
-            if split_vert_idx == None: # no matching vert found, push new one with index and increment for next time
-                split_vert_idx = split_index_cur
-                split_verts[new_split_vert] = split_vert_idx
-                split_index_cur += 1
-            else:
-                num_shared_verts += 1
-            index_buffer.append(split_vert_idx)
+    if mesh_identifier in tracer_data.geoIndex:
+        return tracer_data.geoIndex[mesh_identifier]
 
-    split_vert_items = list(split_verts.items())
-    split_vert_items.sort(key=lambda x: x[1]) #sort by index
-    interleaved_buffer = [item[0] for item in split_vert_items] # strip off index
-    co_buffer, normal_buffer, uv_buffer, bone_weights_buffer, bone_indices_buffer = zip(*interleaved_buffer)
+    isParentArmature = mesh.parent != None and mesh.parent.type == 'ARMATURE'
 
-
-    # should unify the list sizes
-    geoPack.vSize = len(co_buffer)
-    geoPack.iSize = len(index_buffer)
-    geoPack.nSize = len(normal_buffer)
-    geoPack.uvSize = len(uv_buffer)
-    geoPack.bWSize = 0
-    geoPack.vertices = []
-    geoPack.indices = []
-    geoPack.normals = []
-    geoPack.uvs = []
-    geoPack.boneWeights = []
-    geoPack.boneIndices = []
-
-    if isParentArmature:
-        for vert_data in interleaved_buffer:
-            _, _, _, vert_bone_weights, vert_bone_indices = vert_data
-            geoPack.boneWeights.extend(vert_bone_weights)
-            geoPack.boneIndices.extend(vert_bone_indices)
-
-        geoPack.bWSize = len(co_buffer)
-
-    for i, vert in enumerate(interleaved_buffer):
-        geoPack.vertices.append(vert[0][0])
-        geoPack.vertices.append(vert[0][2])
-        geoPack.vertices.append(vert[0][1])
-
-        geoPack.normals.append(-vert[1][0])
-        geoPack.normals.append(-vert[1][2])
-        geoPack.normals.append(-vert[1][1])
-        
-        geoPack.uvs.append(vert[2][0])
-        geoPack.uvs.append(vert[2][1])
-    bm.free()
-
-    
-    geoPack.indices = index_buffer
+    # bulk read of the mesh arrays, hashed only if the geometry cache or the sharing of identical geometry needs it
+    raw = read_mesh_data(mesh.data, skinned=isParentArmature)
+    if tracer_data.geoCache != None or tracer_props.dedup_geo_by_content:
+        geoPack.contentHash = content_hash(raw, tracer_props.weld_tolerance)
+    else:
+        geoPack.contentHash = None
     geoPack.mesh = mesh
+    geoPack.byteData = None
+    geoPack.future = None
+
+    # optionally share the geometry of different datablocks with identical content
+    if tracer_props.dedup_geo_by_content and geoPack.contentHash in tracer_data.geoHashIndex:
+        geoId = tracer_data.geoHashIndex[geoPack.contentHash]
+        tracer_data.geoIndex[mesh_identifier] = geoId
+        return geoId
+
+    if tracer_data.geoCache != None:
+        geoPack.byteData = tracer_data.geoCache.get(geoPack.contentHash)
+        if geoPack.byteData != None:
+            return append_geo(geoPack)
+
+    # the NumPy part runs on the geometry pool if there is one, finish_geometry collects the results
+    if tracer_data.workerPool != None:
+        geoPack.future = tracer_data.workerPool.submit(process_geometry, raw, tracer_props.weld_tolerance)
+    else:
+        set_geometry(geoPack, process_geometry(raw, tracer_props.weld_tolerance))
     
-    
+    return append_geo(geoPack)
+
+## Store the buffers of a processed geometry in its geometry package
+#  The arrays are kept as NumPy arrays, get_geo_bytes_array writes them into the byte block without conversion
+def set_geometry(geoPack, geometry):
+    # should unify the list sizes
+    geoPack.vSize = len(geometry.vertices)
+    geoPack.iSize = len(geometry.indices)
+    geoPack.nSize = len(geometry.normals)
+    geoPack.uvSize = len(geometry.uvs)
+    geoPack.bWSize = 0 if geometry.bone_weights is None else len(geometry.bone_weights)
+    geoPack.vertices = geometry.vertices
+    geoPack.normals = geometry.normals
+    geoPack.uvs = geometry.uvs
+    geoPack.indices = geometry.indices
+    geoPack.boneWeights = geometry.bone_weights
+    geoPack.boneIndices = geometry.bone_indices
+    geoPack.future = None
+
+## Wait for the geometry still processed on the pool and store the results, in geoId order
+def finish_geometry():
+    for geoPack in tracer_data.geoList:
+        if geoPack.future != None:
+            set_geometry(geoPack, geoPack.future.result())
+
+## Append a processed geometry package and register it in the geometry lookup indices
+#  @returns     The geoId of the package
+def append_geo(geoPack) -> int:
+    geoId = len(tracer_data.geoList)
+    tracer_data.geoIndex[geoPack.identifier] = geoId
+    if geoPack.contentHash != None:
+        tracer_data.geoHashIndex.setdefault(geoPack.contentHash, geoId)
     tracer_data.geoList.append(geoPack)
-    return (len(tracer_data.geoList)-1)
+    return geoId
 
+## Identifier of the geometry of an object
+#  Meshes are identified by their Mesh datablock, so that linked duplicates (objects sharing
+#  the same data) are sent once and reference the same geoId. Skinned and static uses of the
+#  same datablock produce different geometry and get different identifiers.
 def generate_mesh_identifier(obj):
     if obj.type == 'MESH':
-        return f"Mesh_{obj.name}_{len(obj.data.vertices)}"
+        skinned = obj.parent != None and obj.parent.type == 'ARMATURE'
+        return f"Mesh_{obj.data.as_pointer()}_{int(skinned)}"
     elif obj.type == 'ARMATURE':
-        return f"Armature_{obj.name}_{len(obj.data.bones)}"
+        return f"Armature_{obj.data.as_pointer()}"
     else:
         return f"{obj.type}_{obj.name}"
 
@@ -894,46 +959,40 @@ def get_nodes_byte_array():
             nodeBinary.extend(struct.pack('i', node.characterRootID))
             nodeBinary.extend(struct.pack('3f', *node.boundExtents))
             nodeBinary.extend(struct.pack('3f', *node.boundCenter))
-            nodeBinary.extend(struct.pack('%sf'% node.bindPoseLength * 16, *node.bindPoses))
-            nodeBinary.extend(struct.pack('%si'% node.skinnedMeshBoneIDsSize, *node.skinnedMeshBoneIDs))
+            nodeBinary.extend(np.asarray(node.bindPoses, dtype=FLOAT32).tobytes())
+            nodeBinary.extend(np.asarray(node.skinnedMeshBoneIDs, dtype=INT32).tobytes())
         
                     
         tracer_data.nodesByteData.extend(nodeBinary)
 
 ### Pack geometric data into byte array
-def get_geo_bytes_array():        
+#  The size of all geometry blocks is known up front, so the arrays are written directly
+#  into one preallocated buffer instead of growing it block by block
+def get_geo_bytes_array():
+    blocks = []
     for geo in tracer_data.geoList:
-        geoBinary = bytearray([])
-        
-        geoBinary.extend(struct.pack('i', geo.vSize))
-        geoBinary.extend(struct.pack('%sf' % geo.vSize*3, *geo.vertices))
-        geoBinary.extend(struct.pack('i', geo.iSize))
-        geoBinary.extend(struct.pack('%si' % geo.iSize, *geo.indices))
-        geoBinary.extend(struct.pack('i', geo.nSize))
-        geoBinary.extend(struct.pack('%sf' % geo.nSize*3, *geo.normals))
-        geoBinary.extend(struct.pack('i', geo.uvSize))
-        geoBinary.extend(struct.pack('%sf' % geo.uvSize*2, *geo.uvs))
-        geoBinary.extend(struct.pack('i', geo.bWSize))
-        if(geo.bWSize > 0):
-            geoBinary.extend(struct.pack('%sf' % geo.bWSize*4, *geo.boneWeights))
-            geoBinary.extend(struct.pack('%si' % geo.bWSize*4, *geo.boneIndices))
+        # geometry loaded from the cache is already packed
+        if geo.byteData != None:
+            blocks.append([geo.byteData])
+        else:
+            blocks.append(geometry_fields(geo.vertices, geo.indices, geo.normals, geo.uvs, geo.boneWeights, geo.boneIndices))
 
-        
-        tracer_data.geoByteData.extend(geoBinary)
+    geoBinary = bytearray(sum(packed_size(fields) for fields in blocks))
+    offset = 0
+    for geo, fields in zip(tracer_data.geoList, blocks):
+        end = pack_into(geoBinary, offset, fields)
+        if geo.byteData == None and tracer_data.geoCache != None:
+            tracer_data.geoCache.put(geo.contentHash, memoryview(geoBinary)[offset:end])
+        offset = end
+
+    tracer_data.geoByteData = geoBinary
 
 ### Pack texture data into byte array        
 def get_textures_byte_array():
     if len(tracer_data.textureList) > 0:
         for tex in tracer_data.textureList:
-            texBinary = bytearray([])
-    
-            texBinary.extend(struct.pack('i', tex.width))
-            texBinary.extend(struct.pack('i', tex.height))
-            texBinary.extend(struct.pack('i', tex.format))
-            texBinary.extend(struct.pack('i', tex.colorMapDataSize))
-            texBinary.extend(tex.colorMapData)
-            
-            tracer_data.texturesByteData.extend(texBinary)
+            # the encoded block (original file or capped level) is kept in the texture store
+            tracer_data.texturesByteData.extend(tex.byteData)
 
 ### Pack Material data into byte array        
 def get_materials_byte_array():
@@ -966,14 +1025,12 @@ def get_character_byte_array():
             charBinary.extend(struct.pack('i', chr.sMSize)) 
             charBinary.extend(struct.pack('i', chr.characterRootID))
             
-            formatBoneMapping = f'{len(chr.boneMapping)}i'
-            formatSkeletonMapping = f'{len(chr.skeletonMapping)}i'
-            charBinary.extend(struct.pack(formatBoneMapping, *chr.boneMapping))
-            charBinary.extend(struct.pack(formatSkeletonMapping, *chr.skeletonMapping))
+            charBinary.extend(np.asarray(chr.boneMapping, dtype=INT32).tobytes())
+            charBinary.extend(np.asarray(chr.skeletonMapping, dtype=INT32).tobytes())
             
-            charBinary.extend(struct.pack('%sf' % chr.sMSize*3, *chr.bonePosition))
-            charBinary.extend(struct.pack('%sf' % chr.sMSize*4, *chr.boneRotation))
-            charBinary.extend(struct.pack('%sf' % chr.sMSize*3, *chr.boneScale))
+            charBinary.extend(np.asarray(chr.bonePosition, dtype=FLOAT32).tobytes())
+            charBinary.extend(np.asarray(chr.boneRotation, dtype=FLOAT32).tobytes())
+            charBinary.extend(np.asarray(chr.boneScale, dtype=FLOAT32).tobytes())
 
             tracer_data.charactersByteData.extend(charBinary) 
 
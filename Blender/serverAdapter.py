@@ -36,7 +36,6 @@ individual license agreement.
 import time 
 import threading
 import bpy
-import struct
 import mathutils
 import math
 from enum import Enum
@@ -44,7 +43,10 @@ from collections import deque
 import numpy as np
 from .timer import TimerModalOperator
 
-from .AbstractParameter import AbstractParameter, Parameter
+from .AbstractParameter import AbstractParameter, Parameter, TRACERParamType
+from .networkThread import NetworkThread
+from .updateBatcher import UpdateBatcher
+from .messageCodec import RECORD_HEADER, LOCK_BODY, encode_header, encode_record, encode_record_message, encode_lock, decode_record, decode_lock
 
 class MessageType(Enum):
     PARAMETERUPDATE = 0
@@ -57,39 +59,30 @@ class MessageType(Enum):
     DATAHUB         = 7
     RPC             = 8
 
+## Maximum time in seconds the listener spends applying received messages per tick
+LISTENER_BUDGET = 0.008
+
 m_pingTimes = deque([0, 0, 0, 0, 0])
 pingRTT = 0
 ## Setup ZMQ thread
+#  All sockets are owned by the network thread, the main thread only applies received updates
 def set_up_thread():
-    try:
-        import zmq
-    except Exception as e:
-        print('Could not import ZMQ\n' + str(e))
     global tracer_data, tracer_props
     tracer_data = bpy.context.window_manager.tracer_data
     tracer_props = bpy.context.scene.tracer_properties
-    # Prepare ZMQ
-    tracer_data.ctx = zmq.Context()
-
-    # Prepare Subscriber
-    tracer_data.socket_s = tracer_data.ctx.socket(zmq.SUB)
-    tracer_data.socket_s.connect(f'tcp://{v_prop.server_ip}:{v_prop.sync_port}')
-    tracer_data.socket_s.setsockopt_string(zmq.SUBSCRIBE, "")
-    tracer_data.socket_s.setsockopt(zmq.RCVTIMEO,1)
-    
 
-    
-    bpy.app.timers.register(listener)
-    
-    # Prepare Distributor
-    tracer_data.socket_d = tracer_data.ctx.socket(zmq.REP)
-    tracer_data.socket_d.bind(f'tcp://{v_prop.server_ip}:{v_prop.dist_port}')
-
-    # Prepare poller
-    tracer_data.poller = zmq.Poller()
-    tracer_data.poller.register(tracer_data.socket_d, zmq.POLLIN)    
+    tracer_data.network = NetworkThread(tracer_props.server_ip, tracer_props.dist_port, tracer_props.sync_port, tracer_props.update_sender_port)
+    tracer_data.network.set_scene(scene_payloads())
+    try:
+        tracer_data.network.start()
+    except Exception as e:
+        print('Could not start the network thread\n' + str(e))
+        tracer_data.network = None
+        return
 
-    bpy.app.timers.register(read_thread)
+    tracer_data.updateBatcher = UpdateBatcher(tracer_props.max_update_message_size)
+    bpy.app.timers.register(listener)
+    bpy.app.timers.register(flush_parameter_updates)
     
     if hasattr(bpy.types, 'WM_OT_timer_modal_operator'):
         print("Timer Modal Operator already registered")
@@ -98,11 +91,18 @@ def set_up_thread():
     
     bpy.ops.wm.timer_modal_operator()
 
-    tracer_data.socket_u = tracer_data.ctx.socket(zmq.PUB)
-    tracer_data.socket_u.connect(f'tcp://{v_prop.server_ip}:{v_prop.update_sender_port}')
-
     #set_up_thread_socket_c()
 
+## Hand the newly gathered scene over to the network thread
+def update_distributed_scene():
+    tracer_data = bpy.context.window_manager.tracer_data
+    if tracer_data.network != None:
+        tracer_data.network.set_scene(scene_payloads())
+
+## Queue a message for all TRACER clients (sent by the network thread)
+def send_message(msg: bytearray):
+    if tracer_data.network != None:
+        tracer_data.network.send(msg)
     
 def set_up_thread_socket_c():
     global tracer_data, tracer_props
@@ -115,101 +115,72 @@ def set_up_thread_socket_c():
     ping_thread.start()
     print("Ping thread started")
 
-## Read requests and send packages
-def read_thread():
-    global tracer_data, tracer_props
-    tracer_data = bpy.context.window_manager.tracer_data
-    tracer_props = bpy.context.scene.tracer_properties
-    if tracer_data.socket_d:
-        # Get sockets with messages (0: don't wait for msgs)
-        sockets = dict(tracer_data.poller.poll(0))
-        # Check if this socket has a message
-        if tracer_data.socket_d in sockets:
-            # Receive message
-            msg = tracer_data.socket_d.recv_string()
-            # Classify message
-            if msg == "header":
-                print("Header request! Sending...")
-                tracer_data.socket_d.send(tracer_data.headerByteData)
-            elif msg == "nodes":
-                print("Nodes request! Sending...")
-                tracer_data.socket_d.send(tracer_data.nodesByteData)
-            elif msg == "objects":
-                print("Object request! Sending...")
-                tracer_data.socket_d.send(tracer_data.geoByteData)
-            elif msg == "characters":
-                print("Characters request! Sending...")
-                if(tracer_data.charactersByteData != None):
-                    tracer_data.socket_d.send(tracer_data.charactersByteData)
-            elif msg == "textures":
-                print("Texture request! Sending...")                
-                if(tracer_data.textureList != None):
-                    tracer_data.socket_d.send(tracer_data.texturesByteData)
-            elif msg == "materials":
-                print("Materials request! Sending...")
-                if(tracer_data.materialsByteData != None):
-                    tracer_data.socket_d.send(tracer_data.materialsByteData)
-            #elif msg == "curve":
-            #    print("curve request! Sending...")
-            #    if(tracer_data.curvesByteData != None):
-            #        tracer_data.socket_d.send(tracer_data.curvesByteData)
-            else: # sent empty
-                tracer_data.socket_d.send_string("")
-    return 0.1 # repeat every .1 second
+## Scene data sent for every request of the distributor
+def scene_payloads() -> dict:
+    return {"header":       tracer_data.headerByteData,
+            "nodes":        tracer_data.nodesByteData,
+            "objects":      tracer_data.geoByteData,
+            "characters":   tracer_data.charactersByteData,
+            "textures":     tracer_data.texturesByteData,
+            "materials":    tracer_data.materialsByteData}
 
 global last_sync_time
 last_sync_time = None 
 
 ## process scene updates
+#  Drains the messages received by the network thread, up to LISTENER_BUDGET per tick.
+#  Parameter updates are coalesced: if a parameter is updated several times within one
+#  tick only its latest value is applied to Blender. Key blocks are all applied, see process_parameter_updates.
 def listener():
     global tracer_data, tracer_props, last_sync_time
     tracer_data = bpy.context.window_manager.tracer_data
     tracer_props = bpy.context.scene.tracer_properties
-    msg = None
+    if tracer_data.network == None:
+        return 0.01
+
+    tick_start = time.perf_counter()
+    parameter_updates = {}
+    message = tracer_data.network.receive()
+    while message != None:
+        process_message(message, parameter_updates)
+        if time.perf_counter() - tick_start >= LISTENER_BUDGET:
+            break
+        message = tracer_data.network.receive()
+
+    process_parameter_updates(parameter_updates)
+    tracer_data.network.record_tick(time.perf_counter() - tick_start)
+
+    return 0.01 # repeat every .01 second
+
+## Apply one received message (header already decoded by the network thread)
+#  @param parameter_updates     Collects the parameter updates of the tick, see collect_parameter_updates
+def process_message(message, parameter_updates: dict):
+    msg = message.data
+    msg_type = message.type
     
-    try:
-        msg = tracer_data.socket_s.recv()
-    except Exception as e:
-        msg = None
-
-
-    ## Reading msg
-    #   0   - clientID  - byte
-    #   1   - time      - byte
-    #   2   - msgType   - byte
-    #   3+  - msgBody
-    if msg != None:
-        client_ID   = msg[0]
-        msg_time    = msg[1]
-        msg_type    = msg[2]
-        
-        if msg_type == MessageType.SYNC.value:
-            process_sync_msg(msg)
-
-        if client_ID != tracer_data.cID:
-            start = 3
-
-            while start < len(msg):
-                if msg_type == MessageType.LOCK.value:
-                    last_index = process_lock_msg(msg, start)
-                    start = last_index
-                elif msg_type == MessageType.PARAMETERUPDATE.value:
-                    last_index = process_parameter_update(msg, start)
-                    start = last_index
-                elif msg_type == MessageType.RPC.value:
-                    last_index = process_RPC_msg(msg, start)
-                    start = last_index
-                else:
-                    start = len(msg)
-    return 0.01 # repeat every .1 second
+    if msg_type == MessageType.SYNC.value:
+        process_sync_msg(msg)
+
+    if message.client_id != tracer_data.cID:
+        start = 3
+
+        while start < len(msg):
+            if msg_type == MessageType.LOCK.value:
+                last_index = process_lock_msg(msg, start)
+                start = last_index
+            elif msg_type == MessageType.PARAMETERUPDATE.value:
+                last_index = collect_parameter_updates(msg, parameter_updates, start)
+                start = last_index
+            elif msg_type == MessageType.RPC.value:
+                last_index = process_RPC_msg(msg, start)
+                start = last_index
+            else:
+                start = len(msg)
                 
 ## Stopping the thread and closing the sockets
 
 def create_ping_msg():
-    tracer_data.pingByteMSG = bytearray([])
-    tracer_data.pingByteMSG.extend(struct.pack('B', tracer_data.cID))
-    tracer_data.pingByteMSG.extend(struct.pack('B', tracer_data.time))
-    tracer_data.pingByteMSG.extend(struct.pack('B', 3))
+    tracer_data.pingByteMSG = encode_header(tracer_data.cID, tracer_data.time, MessageType.PING.value)
     
 def ping_thread_function():
     while True:
@@ -230,6 +201,7 @@ def ping():
             print(f"Failed to receive pong: {e}")
     
 def decode_pong_msg(msg):
+    global pingRTT
     rtt = delta_time(tracer_data.time, tracer_data.pingStartTime ,TimerModalOperator.my_instance.m_timesteps)
     pingCount = len(m_pingTimes)
     
@@ -244,6 +216,9 @@ def decode_pong_msg(msg):
 
     if pingCount > 1:
         pingRTT = round((rttSum - rttMax) / (pingCount - 1))
+        if tracer_data.updateBatcher != None:
+            # pingRTT is measured in timer steps
+            tracer_data.updateBatcher.adapt_to_rtt(pingRTT / TimerModalOperator.my_instance.framerate)
 
 def process_sync_msg(msg: bytearray, start=0):
     current_time = time.time()
@@ -255,53 +230,95 @@ def process_sync_msg(msg: bytearray, start=0):
         tracer_data.time = int(round(sv_time)) % TimerModalOperator.my_instance.m_timesteps
     
 
+## Queue the update of a parameter, all updates of a tick are sent together by flush_parameter_updates
 def send_parameter_update(parameter: Parameter):
-    tracer_data.ParameterUpdateMSG = bytearray([])
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', tracer_data.cID))                       # client ID
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', tracer_data.time))                      # sync time
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', MessageType.PARAMETERUPDATE.value))     # message type
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', tracer_data.cID))                       #? scene ID?
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('<H', parameter.parent_object.object_id))     # scene object ID
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('<H', parameter.get_parameter_id()))          # parameter ID
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', parameter.get_tracer_type()))           # parameter type
     length = 10 + parameter.get_size()
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('<I', length))                                # message length
-    tracer_data.ParameterUpdateMSG.extend(parameter.serialize())
-
-    tracer_data.socket_u.send(tracer_data.ParameterUpdateMSG)
-
-def process_parameter_update(msg: bytearray, start=0) -> int:
-    param: Parameter = None
-    msg_size = len(msg) # for debugging
-    updated_animation = False
-
-    while start < len(msg):
-        scene_id    = struct.unpack( 'B', msg[start   : start+1 ])[0]
-        obj_id      = struct.unpack('<H', msg[start+1 : start+3 ])[0] # unpack object ID; 2 bytes (unsigned short); little endian
-        param_id    = struct.unpack('<H', msg[start+3 : start+5 ])[0]
-        param_type  = struct.unpack( 'B', msg[start+5 : start+6 ])[0]
-        length      = struct.unpack('<I', msg[start+6 : start+10])[0] # unpack length of parameter data; 4 bytes (uint); little endian (includes the header bytes)
-
-        msg_payload = msg[start+10 : start+length] # Extracting only the data for the current parameter from the message
-
-        if 0 < obj_id <= len(tracer_data.SceneObjects) and 0 <= param_id < len(tracer_data.SceneObjects[obj_id - 1].parameter_list):
-            param = tracer_data.SceneObjects[obj_id - 1].parameter_list[param_id]
-            # If receiveng an animated parameter udpate on a parameter that is not already animated
-            # Note: 10 is the size of the header
-            if not param.is_animated and param.get_size() < length-10:
-                param.init_animation()
-
-            param.deserialize(msg_payload)
-
-            updated_animation = updated_animation or param.key_list.has_changed # If only one parameter animation is updated flag the animation to be updated later
+    record = encode_record(tracer_data.cID,                     #? scene ID?
+                           parameter.parent_object.object_id,   # scene object ID
+                           parameter.get_parameter_id(),        # parameter ID
+                           parameter.get_tracer_type(),         # parameter type
+                           length,                              # message length
+                           parameter.serialize())
+
+    if tracer_data.updateBatcher != None:
+        tracer_data.updateBatcher.add((parameter.parent_object.object_id, parameter.get_parameter_id()), record,
+                                      1.0 / update_rate(parameter.get_tracer_type()))
+
+## Target send rate (updates per second) of a parameter type
+def update_rate(param_type: int) -> float:
+    if param_type in (TRACERParamType.VECTOR3.value, TRACERParamType.QUATERNION.value):
+        return tracer_props.transform_update_rate
+    return tracer_props.property_update_rate
+
+## Send the parameter updates collected since the last flush as PARAMETERUPDATE messages
+#  Registered as timer, repeats every flush interval
+#  @param force     Send all pending updates, also those whose send interval has not passed yet
+def flush_parameter_updates(force: bool = False):
+    if tracer_data.updateBatcher == None:
+        return None
+    tracer_data.updateBatcher.max_message_size = tracer_props.max_update_message_size
+    if len(tracer_data.updateBatcher) > 0:
+        header = encode_header(tracer_data.cID, tracer_data.time, MessageType.PARAMETERUPDATE.value)
+        for msg in tracer_data.updateBatcher.take_messages(header, force=force):
+            send_message(msg)
+    return tracer_props.update_flush_interval
+
+## Collect the parameter records of an update message
+#  The records of a parameter are kept in the order they were received, see process_parameter_updates.
+#  @param updates   (object ID, parameter ID) -> list of (record length, payload)
+#  @returns         Index after the last record
+def collect_parameter_updates(msg: bytearray, updates: dict, start=0) -> int:
+    view = memoryview(msg)  # the payloads are views into the message, not copies
+    while start + RECORD_HEADER.size <= len(msg):
+        scene_id, obj_id, param_id, param_type, length, payload = decode_record(view, start)
+
+        if length < RECORD_HEADER.size:
+            return len(msg)     # malformed record, the rest of the message can not be parsed
+
+        # re-insert, so that the parameters are applied in the order of their latest update
+        records = updates.pop((obj_id, param_id), [])
+        records.append((length, payload))
+        updates[(obj_id, param_id)] = records
                     
         start += length
+    return max(start, len(msg))   # a truncated record at the end is dropped
+
+## Apply the collected parameter updates to the scene objects
+#  Values are state, so of the value updates of a parameter only the latest is applied.
+#  Key blocks are deltas (e.g. one frame of an AnimHost stream), so all of them are applied
+#  in order and the keys of the later blocks are merged into the key list.
+#  @param updates   (object ID, parameter ID) -> list of (record length, payload), see collect_parameter_updates
+def process_parameter_updates(updates: dict):
+    animated_objects = []
+    updated_objects = {}
+
+    for (obj_id, param_id), records in updates.items():
+        if 0 < obj_id <= len(tracer_data.SceneObjects) and 0 <= param_id < len(tracer_data.SceneObjects[obj_id - 1].parameter_list):
+            param = tracer_data.SceneObjects[obj_id - 1].parameter_list[param_id]
+            data_size = param.get_data_size()
+            # all records carrying keys, in order, followed by the latest record if it only carries a value
+            to_apply = [record for record in records if len(record[1]) > data_size]
+            if len(records[-1][1]) <= data_size:
+                to_apply.append(records[-1])
+
+            for i, (length, msg_payload) in enumerate(to_apply):
+                # If receiveng an animated parameter udpate on a parameter that is not already animated
+                if not param.is_animated and len(msg_payload) > data_size:
+                    param.init_animation()
+                param.deserialize(msg_payload, merge_keys=i > 0)
+            updated_objects[param.parent_object] = None
+
+            # If a parameter animation is updated flag the animation of its object to be updated later
+            if param.key_list.has_changed and param.parent_object not in animated_objects:
+                animated_objects.append(param.parent_object)
     
-    # At the end of the reading, if the message received was an Animation Parameter Update, trigger baking the animation over the (Character) Object
-    if param != None and updated_animation:
-        param.parent_object.populate_timeline_with_animation()
+    # Apply what the scene objects collected from the updates of the tick at once (e.g. the pose of characters)
+    for scene_object in updated_objects:
+        scene_object.apply_pending_updates()
 
-    return start
+    # At the end of the tick, if Animation Parameter Updates were received, trigger baking the animation over the (Character) Objects
+    for scene_object in animated_objects:
+        scene_object.populate_timeline_with_animation()
 
 
 def send_RPC_msg(rpc_parameter: Parameter):
@@ -309,71 +326,71 @@ def send_RPC_msg(rpc_parameter: Parameter):
     scene_id    = 255   if rpc_parameter.parent_object == None else rpc_parameter.get_object_id()
     object_id   = 1     if rpc_parameter.parent_object == None else rpc_parameter.get_object_id()
 
-    tracer_data.ParameterUpdateMSG = bytearray([])
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', tracer_data.cID))                       # client ID
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', tracer_data.time))                      # sync time
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', MessageType.RPC.value))                 # message type
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', scene_id))                              # scene ID (not assigned to a specific scene - for AnimHost)
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('<H', object_id))                             # object ID (not assigned to a specific object)
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('<H', rpc_parameter.get_parameter_id()))      # parameter/call ID
-    tracer_data.ParameterUpdateMSG.extend(struct.pack(' B', rpc_parameter.get_tracer_type()))       # parameter type
     length = 10 + rpc_parameter.get_data_size()
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('<I', length))                                # message length
-    tracer_data.ParameterUpdateMSG.extend(rpc_parameter.serialize_data())
-
-    tracer_data.socket_u.send(tracer_data.ParameterUpdateMSG)
+    tracer_data.ParameterUpdateMSG = encode_record_message(tracer_data.cID,                     # client ID
+                                                           tracer_data.time,                    # sync time
+                                                           MessageType.RPC.value,               # message type
+                                                           scene_id,                            # scene ID (not assigned to a specific scene - for AnimHost)
+                                                           object_id,                           # object ID (not assigned to a specific object)
+                                                           rpc_parameter.get_parameter_id(),    # parameter/call ID
+                                                           rpc_parameter.get_tracer_type(),     # parameter type
+                                                           length,                              # message length
+                                                           rpc_parameter.serialize_data())
+
+    send_message(tracer_data.ParameterUpdateMSG)
 
 def process_RPC_msg(msg: bytearray, start=0):
-    scene_id    = struct.unpack( 'B', msg[start   : start+1 ])[0]
-    obj_id      = struct.unpack('<H', msg[start+1 : start+3 ])[0] # unpack object ID; 2 bytes (unsigned short); little endian
-    call_id     = struct.unpack('<H', msg[start+3 : start+5 ])[0]
-    param_type  = struct.unpack( 'B', msg[start+5 : start+6 ])[0]
-    length      = struct.unpack('<I', msg[start+6 : start+10])[0] # unpack length of parameter data; 4 bytes (uint); little endian (includes the header bytes)
-    start =+ length
+    if start + RECORD_HEADER.size > len(msg):
+        return len(msg)
+    scene_id, obj_id, call_id, param_type, length, payload = decode_record(memoryview(msg), start)
+    start = len(msg) if length < RECORD_HEADER.size else start + length
 
     # Do something with the information:)
 
     return start
 
 def send_lock_msg(sceneObject, value: bool = True):
-    tracer_data.ParameterUpdateMSG = bytearray([])
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', tracer_data.cID))            # client ID
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', tracer_data.time))           # sync time
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', MessageType.LOCK.value))     # message type
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', tracer_data.cID))            #? scene ID?
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('H', sceneObject.object_id))      # object ID
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', int(value)))                 # bool value (True)
-    tracer_data.socket_u.send(tracer_data.ParameterUpdateMSG)
+    flush_parameter_updates(force=True)     # pending updates were made while the lock state was still the old one
+    tracer_data.ParameterUpdateMSG = encode_lock(tracer_data.cID, tracer_data.time, MessageType.LOCK.value,
+                                                 tracer_data.cID,           #? scene ID?
+                                                 sceneObject.object_id,
+                                                 value)
+    send_message(tracer_data.ParameterUpdateMSG)
 
 def send_unlock_msg(sceneObject):
-    tracer_data.ParameterUpdateMSG = bytearray([])
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', tracer_data.cID))            # client ID
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', tracer_data.time))           # sync time
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', MessageType.LOCK.value))     # message type
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', tracer_data.cID))            #? scene ID?
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('H', sceneObject.object_id))      # object ID
-    tracer_data.ParameterUpdateMSG.extend(struct.pack('B', 0))                          # bool value (False)
-    tracer_data.socket_u.send(tracer_data.ParameterUpdateMSG)
+    flush_parameter_updates(force=True)     # pending updates were made while the lock state was still the old one
+    tracer_data.ParameterUpdateMSG = encode_lock(tracer_data.cID, tracer_data.time, MessageType.LOCK.value,
+                                                 tracer_data.cID,           #? scene ID?
+                                                 sceneObject.object_id,
+                                                 False)
+    send_message(tracer_data.ParameterUpdateMSG)
 
 def process_lock_msg(msg: bytearray, start = 0):
-    scene_id    = struct.unpack( 'B', msg[start   : start+1])[0]
-    obj_id      = struct.unpack('<H', msg[start+1 : start+3])[0]
+    if start + LOCK_BODY.size > len(msg):
+        return len(msg)
+    scene_id, obj_id, lockstate = decode_lock(msg, start)
     if 0 < obj_id <= len(tracer_data.SceneObjects):
-        lockstate = struct.unpack( 'B', msg[start+3 : start+4])[0]
         tracer_data.SceneObjects[obj_id-1].lock_unlock(lockstate)
 
     return len(msg)
     
+## Stop the network thread, which closes the distributor, subscriber and publisher sockets
 def close_socket_d():
     global tracer_data, v_prop
     tracer_data = bpy.context.window_manager.tracer_data
     v_prop = bpy.context.scene.tracer_properties
-    if bpy.app.timers.is_registered(read_thread):
-        print("Stopping thread")
-        bpy.app.timers.unregister(read_thread)
-        bpy.utils.unregister_class(TimerModalOperator)
-    if tracer_data.socket_d:
-        tracer_data.socket_d.close()
+    if bpy.app.timers.is_registered(listener):
+        print("Stopping subscription")
+        bpy.app.timers.unregister(listener)
+    if bpy.app.timers.is_registered(flush_parameter_updates):
+        bpy.app.timers.unregister(flush_parameter_updates)
+    tracer_data.updateBatcher = None
+    if tracer_data.network != None:
+        print(f"Stopping thread: {tracer_data.network.stats()}")
+        tracer_data.network.stop()
+        tracer_data.network = None
+        if hasattr(bpy.types, 'WM_OT_timer_modal_operator'):
+            bpy.utils.unregister_class(TimerModalOperator)
         
 def close_socket_s():
     global tracer_data, tracer_props
@@ -382,8 +399,6 @@ def close_socket_s():
     if bpy.app.timers.is_registered(listener):
         print("Stopping subscription")
         bpy.app.timers.unregister(listener)
-    if tracer_data.socket_s:
-        tracer_data.socket_s.close()
 
 def close_socket_c():
     global tracer_data, tracer_props
@@ -399,8 +414,9 @@ def close_socket_u():
     global tracer_data, tracer_props
     tracer_data = bpy.context.window_manager.tracer_data
     tracer_props = bpy.context.scene.tracer_properties
-    if tracer_data.socket_u:
-        tracer_data.socket_u.close()
+    if tracer_data.network != None:
+        tracer_data.network.stop()
+        tracer_data.network = None
 
 
 def delta_time(startTime, endTime, length):
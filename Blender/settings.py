@@ -226,6 +226,19 @@ class TracerProperties(bpy.types.PropertyGroup):
     update_sender_port: bpy.props.StringProperty(default = '5557')                                                                                                                                                                                                          # type: ignore
     Command_Module_port: bpy.props.StringProperty(default = '5558')                                                                                                                                                                                                         # type: ignore
     humanoid_rig: bpy.props.BoolProperty(name="Humanoid Rig for Unity",description="Check if using humanoid rig and you need to send the character to Unity", default=False)                                                                                                # type: ignore
+    update_flush_interval: bpy.props.FloatProperty(name='Update Flush Interval', description='Seconds between two sends of the collected parameter updates', default=0.02, min=0.001, max=1.0)                                                                              # type: ignore
+    max_update_message_size: bpy.props.IntProperty(name='Max Update Message Size', description='Maximum size in bytes of one batched parameter update message, larger batches are split', default=65536, min=64)                                                            # type: ignore
+    transform_update_rate: bpy.props.FloatProperty(name='Transform Update Rate', description='Maximum number of updates per second sent for a position, rotation or scale. The latest value is always sent', default=30.0, min=1.0, max=120.0)                              # type: ignore
+    property_update_rate: bpy.props.FloatProperty(name='Property Update Rate', description='Maximum number of updates per second sent for any other parameter (light, camera, material properties)', default=20.0, min=1.0, max=120.0)                                      # type: ignore
+    weld_tolerance: bpy.props.FloatProperty(name='Vertex Weld Tolerance', description='Distance under which split vertices with identical normals, UVs and bone weights are merged when sending geometry. 0 merges only exact duplicates', default=0.0, min=0.0, precision=6)             # type: ignore
+    use_geo_cache: bpy.props.BoolProperty(name='Geometry Cache', description='Keep the processed geometry of every mesh on disk, so that unchanged meshes are not processed again on the next distribution', default=True)                                                  # type: ignore
+    geo_cache_dir: bpy.props.StringProperty(name='Geometry Cache Directory', description='Directory of the geometry and texture caches. Empty uses the TRACER folder in the Blender user data directory', default='', subtype='DIR_PATH')                                                # type: ignore
+    geo_cache_size: bpy.props.IntProperty(name='Geometry Cache Size (MB)', description='Maximum size of the geometry cache on disk. Least recently used entries are removed first', default=2048, min=1)                                                                    # type: ignore
+    worker_count: bpy.props.IntProperty(name='Worker Threads', description='Threads processing geometry and reading textures while the scene is read. 0 uses one per core, 1 keeps everything on the main thread', default=0, min=0, max=64)                                # type: ignore
+    dedup_geo_by_content: bpy.props.BoolProperty(name='Share Identical Geometry', description='Send meshes with identical content only once, even if they use different mesh datablocks. Objects sharing the same datablock always share their geometry', default=False)    # type: ignore
+    texture_max_size: bpy.props.IntProperty(name='Max Texture Size', description='Textures larger than this are downsampled before sending (box filtered, halving until they fit). 0 sends the original files', default=0, min=0)                                           # type: ignore
+    use_texture_cache: bpy.props.BoolProperty(name='Texture Cache', description='Keep the downsampled textures on disk, so that they are not downsampled again on the next distribution', default=True)                                                                      # type: ignore
+    texture_cache_size: bpy.props.IntProperty(name='Texture Cache Size (MB)', description='Maximum size of the texture cache on disk. Least recently used entries are removed first', default=1024, min=1)                                                                  # type: ignore
     tracer_collection: bpy.props.StringProperty(name = 'TRACER Collection', default = 'TRACER_Collection', maxlen=30)                                                                                                                                                       # type: ignore
     overwrite_animation: bpy.props.BoolProperty(name="Overwrite Animation", description="When true, baking an animation received from AnimHost will overwrite the previous one; otherwhise, it writes it on a new layer", default=False)                                    # type: ignore                                                                                                  # type: ignore
     control_rig_name: bpy.props.StringProperty(name='Control Rig', default='', description='Name of the Control Rig used to edit the character in IK mode', update=update_control_rig_name, search=get_all_armatures)                                                       # type: ignore
@@ -269,16 +282,26 @@ class TracerData():
     curveList = []
     editable_objects = []
 
+    # Per-gather lookup indices into the lists above (rebuilt by every gather_scene_data)
+    objectIndex: dict[str, int] = {}    # object name -> index in objectsToTransfer
+    childCounts: dict[str, int] = {}    # object name -> number of children in objectsToTransfer
+    geoIndex: dict[str, int] = {}       # mesh identifier -> index in geoList
+    geoHashIndex: dict[str, int] = {}   # geometry content hash -> index in geoList
+    materialIndex: dict[str, int] = {}  # material name -> index in materialList
+    textureIndex: dict[str, int] = {}   # image name_full -> index in textureList
+
     SceneObjects: list[SceneObject] = []
 
     rootChildCount = 0
     
-    socket_d = None
-    socket_s = None
+    network = None
+    updateBatcher = None
     socket_c = None
-    socket_u = None
-    poller = None
     ctx = None
+    geoCache = None
+    textureCache = None
+    workerPool = None
+    textureStore = None
     cID = None
     time = 0
     pingStartTime = 0
@@ -0,0 +1,96 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import numpy as np
+
+## Maximum number of bone influences per vertex supported by TRACER clients
+MAX_INFLUENCES = 4
+
+## Gather the vertex group memberships of all vertices into flat CSR-style arrays
+#  The only per-element Python work left is reading the group elements;
+#  sorting, selection and padding happen vectorized in select_top_influences.
+#  @param vertices  The MeshVertices collection of a bpy.types.Mesh
+#  @returns         (offsets, groups, weights): the memberships of vertex i are
+#                   groups[offsets[i]:offsets[i+1]] with weights[offsets[i]:offsets[i+1]]
+def gather_vertex_groups(vertices) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    offsets = np.zeros(len(vertices) + 1, dtype=np.int64)
+    groups  = []
+    weights = []
+    # single pass over the vertices, the row offsets are the running count of memberships
+    for i, vert in enumerate(vertices):
+        for element in vert.groups:
+            groups.append(element.group)
+            weights.append(element.weight)
+        offsets[i + 1] = len(groups)
+    return offsets, np.array(groups, dtype=np.int32), np.array(weights, dtype=np.float32)
+
+## Select the strongest influences of every vertex from CSR vertex group arrays
+#  Vertices with fewer influences are padded with group 0 and weight 0.0.
+#  @param offsets       CSR row offsets (n_verts + 1)
+#  @param groups        Flat vertex group indices
+#  @param weights       Flat vertex group weights
+#  @param n_influences  Number of influences to keep per vertex
+#  @param normalize     Whether the kept weights are rescaled to sum up to 1
+#  @returns             (bone_weights, bone_indices) of shape (n_verts, n_influences), sorted by descending weight
+def select_top_influences(offsets: np.ndarray, groups: np.ndarray, weights: np.ndarray,
+                          n_influences: int = MAX_INFLUENCES, normalize: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    n_verts = len(offsets) - 1
+    counts = np.diff(offsets)
+    width = max(int(counts.max()) if n_verts > 0 else 0, n_influences)
+
+    # Scatter the CSR rows into dense (n_verts, width) matrices, padding with weight -1 so that
+    # padding always sorts after real (even zero-weight) memberships
+    rows = np.repeat(np.arange(n_verts), counts)
+    cols = np.arange(len(groups)) - offsets[rows]
+    dense_weights = np.full((n_verts, width), -1.0, dtype=np.float32)
+    dense_groups  = np.zeros((n_verts, width), dtype=np.int32)
+    dense_weights[rows, cols] = weights
+    dense_groups[rows, cols]  = groups
+
+    if width > n_influences:
+        top = np.argpartition(-dense_weights, n_influences - 1, axis=1)[:, :n_influences]
+        dense_weights = np.take_along_axis(dense_weights, top, axis=1)
+        dense_groups  = np.take_along_axis(dense_groups,  top, axis=1)
+
+    order = np.argsort(-dense_weights, axis=1, kind='stable')
+    bone_weights = np.take_along_axis(dense_weights, order, axis=1)
+    bone_indices = np.take_along_axis(dense_groups,  order, axis=1)
+    np.maximum(bone_weights, 0.0, out=bone_weights)
+
+    if normalize:
+        totals = bone_weights.sum(axis=1, keepdims=True)
+        np.divide(bone_weights, totals, out=bone_weights, where=totals > 0)
+
+    return bone_weights, bone_indices
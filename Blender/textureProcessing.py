@@ -0,0 +1,106 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import struct
+import zlib
+import numpy as np
+
+## PNG color type for every channel count (gray, gray + alpha, RGB, RGBA)
+PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+## Read the pixels of a Blender image into a float array (bpy access, main thread only)
+#  Blender stores the rows bottom-up, the returned array is top-down like the image file.
+#  @param image     The bpy.types.Image to read
+#  @returns         Array of shape (height, width, channels) with values in [0, 1]
+def image_pixels(image) -> np.ndarray:
+    width, height = image.size
+    pixels = np.empty(width * height * image.channels, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, image.channels)[::-1]
+
+## Halve the resolution of an image with a 2x2 box filter
+#  Odd sizes repeat the last row / column, so that every output pixel averages four samples.
+#  @param pixels    Array of shape (height, width, channels)
+#  @returns         Float32 array of shape (ceil(height / 2), ceil(width / 2), channels)
+def box_downsample(pixels: np.ndarray) -> np.ndarray:
+    height, width = pixels.shape[:2]
+    if height > 1 and height % 2 == 1:
+        pixels = np.concatenate([pixels, pixels[-1:]], axis=0)
+    if width > 1 and width % 2 == 1:
+        pixels = np.concatenate([pixels, pixels[:, -1:]], axis=1)
+
+    pixels = pixels.astype(np.float32, copy=False)
+    if pixels.shape[0] > 1:
+        pixels = (pixels[0::2] + pixels[1::2]) * 0.5
+    if pixels.shape[1] > 1:
+        pixels = (pixels[:, 0::2] + pixels[:, 1::2]) * 0.5
+    return pixels
+
+## Downsample an image level by level until its larger side fits the cap
+#  @param pixels    Array of shape (height, width, channels)
+#  @param max_size  Maximum width and height of the result
+#  @returns         The first mip level not exceeding max_size (the input itself if it already fits)
+def cap_resolution(pixels: np.ndarray, max_size: int) -> np.ndarray:
+    while max(pixels.shape[:2]) > max_size:
+        pixels = box_downsample(pixels)
+    return pixels
+
+## Convert [0, 1] float pixels to 8 bit
+def to_uint8(pixels: np.ndarray) -> np.ndarray:
+    return np.round(np.clip(pixels, 0.0, 1.0) * 255.0).astype(np.uint8)
+
+## Encode 8 bit pixels as a PNG file (no bpy access, can run on a worker thread)
+#  @param pixels    uint8 array of shape (height, width, channels), top row first
+#  @returns         The PNG file content
+def encode_png(pixels: np.ndarray) -> bytes:
+    height, width, channels = pixels.shape
+
+    # every row starts with filter type 0 (None)
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = pixels.reshape(height, width * channels)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, PNG_COLOR_TYPES[channels], 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(rows.tobytes(), 6)) + chunk(b'IEND', b'')
+
+## Encode a capped texture level as a texture block of the textures message
+#  @param pixels    uint8 array of shape (height, width, channels)
+#  @param format    TRACER texture format id (0: encoded image file)
+#  @returns         width, height, format, data size and PNG data
+def encode_texture_block(pixels: np.ndarray, format: int = 0) -> bytes:
+    data = encode_png(pixels)
+    return struct.pack('4i', pixels.shape[1], pixels.shape[0], format, len(data)) + data
@@ -0,0 +1,127 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import hashlib
+import os
+import struct
+
+from .geoCache import GeoCache
+
+## Encoded texture block of one image file, as sent in the textures message
+class textureEntry:
+    path:           str
+    stamp:          tuple   # (mtime_ns, size, width, height) of the file when it was read
+    contentHash:    str     # hash of the file content, identical files share one texture
+    byteData:       bytes   # width, height, format, data size and file content
+    levels:         dict    # max size -> encoded block of the downsampled level
+
+    def __init__(self, path: str, stamp: tuple, contentHash: str, byteData: bytes):
+        self.path = path
+        self.stamp = stamp
+        self.contentHash = contentHash
+        self.byteData = byteData
+        self.levels = {}
+
+    @property
+    def width(self) -> int:
+        return self.stamp[2]
+
+    @property
+    def height(self) -> int:
+        return self.stamp[3]
+
+## Identify the state of an image file without reading it
+#  @returns     (mtime_ns, size, width, height), raises OSError if the file is missing
+def file_stamp(path: str, width: int, height: int) -> tuple:
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size, width, height)
+
+## Read and encode an image file (runs on a worker thread, no bpy access)
+#  @param path      Absolute path of the image file
+#  @param stamp     The file_stamp taken on the main thread
+#  @param format    TRACER texture format id
+#  @returns         A textureEntry holding the encoded block
+def read_texture(path: str, stamp: tuple, format: int = 0) -> textureEntry:
+    with open(path, 'rb') as tex_file:
+        data = tex_file.read()
+    width, height = stamp[2], stamp[3]
+    header = struct.pack('4i', width, height, format, len(data))
+    content_hash = hashlib.blake2b(header[:12] + data, digest_size=20).hexdigest()
+    return textureEntry(path, stamp, content_hash, header + data)
+
+## In-memory store of encoded texture blocks, kept across scene updates
+#  An entry is reused as long as the modification time, size and resolution of its file are unchanged.
+class TextureStore:
+    def __init__(self):
+        self.__entries: dict[str, textureEntry] = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.reads = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    ## Return the entry of a file if it is still up to date, otherwise None
+    def get(self, path: str, stamp: tuple) -> textureEntry | None:
+        entry = self.__entries.get(path)
+        if entry != None and entry.stamp == stamp:
+            self.hits += 1
+            return entry
+        return None
+
+    def put(self, entry: textureEntry):
+        self.reads += 1
+        self.__entries[entry.path] = entry
+
+    ## Forget entries of files that were not used since the given set of paths was collected
+    def retain(self, paths):
+        for path in list(self.__entries):
+            if path not in paths:
+                del self.__entries[path]
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self), "hits": self.hits, "reads": self.reads}
+
+## Persistent cache of downsampled texture levels
+#  Same eviction rules as the geometry cache, entries are keyed by the content hash of
+#  the source file and the resolution cap the level was produced for.
+class TextureCache(GeoCache):
+    FILE_EXTENSION = ".ttex"
+
+    @staticmethod
+    def key(content_hash: str, max_size: int) -> str:
+        return f"{content_hash}_{max_size}"
@@ -110,6 +110,11 @@ def clean_up_tracer_data(level):
         tracer_data.geoList = [] #list of geometry data
         tracer_data.materialList = [] # list of materials
         tracer_data.textureList = [] #list of textures
+        tracer_data.objectIndex = {}
+        tracer_data.geoIndex = {}
+        tracer_data.geoHashIndex = {}
+        tracer_data.materialIndex = {}
+        tracer_data.textureIndex = {}
 
     if level > 1:
         tracer_data.editableList = []
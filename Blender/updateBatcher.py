@@ -0,0 +1,113 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+import time
+
+## Collects the parameter update records of one tick and packs them into as few messages as possible
+#  A record is the wire form of one parameter update (scene ID, object ID, parameter ID, type,
+#  length and data), a PARAMETERUPDATE message is a 3 byte header followed by any number of records.
+#  If a parameter is updated several times before the batch is flushed, only its latest record is kept.
+#
+#  Every record can carry a minimum send interval: a parameter sent less than its interval ago
+#  stays pending (and keeps being replaced by newer values) until the interval has passed, so
+#  the latest value is always sent, at most at the target rate. interval_scale stretches all
+#  intervals, see adapt_to_rtt.
+class UpdateBatcher:
+    ## Round trip time in seconds up to which records are sent at their full rate
+    TARGET_RTT = 0.05
+    ## Largest factor by which adapt_to_rtt stretches the send intervals
+    MAX_RATE_REDUCTION = 8.0
+
+    def __init__(self, max_message_size: int = 65536):
+        self.max_message_size = max_message_size
+        self.interval_scale = 1.0
+        self.__records: dict[tuple, bytes] = {}
+        self.__intervals: dict[tuple, float] = {}
+        # send time and interval of the parameters sent less than their interval ago
+        self.__last_sent: dict[tuple, tuple[float, float]] = {}
+        self.messages_sent = 0
+        self.records_sent = 0
+        self.records_replaced = 0
+
+    def __len__(self) -> int:
+        return len(self.__records)
+
+    ## Add (or replace) the pending record of a parameter
+    #  @param key           Identifies the parameter, e.g. (object ID, parameter ID)
+    #  @param record        The packed record
+    #  @param min_interval  Minimum time in seconds between two sends of this parameter
+    def add(self, key: tuple, record: bytes, min_interval: float = 0.0):
+        # re-insert, so that records are sent in the order of their latest update
+        if self.__records.pop(key, None) != None:
+            self.records_replaced += 1
+        self.__records[key] = record
+        self.__intervals[key] = min_interval
+
+    ## Send less often on a congested network
+    #  Above TARGET_RTT, the send intervals grow proportionally to the round trip time (up to MAX_RATE_REDUCTION)
+    #  @param rtt   Measured round trip time in seconds
+    def adapt_to_rtt(self, rtt: float):
+        self.interval_scale = min(max(1.0, rtt / self.TARGET_RTT), self.MAX_RATE_REDUCTION)
+
+    ## Take the pending records that are due, packed into messages of at most max_message_size bytes
+    #  A single record larger than the limit is sent in a message of its own.
+    #  @param header    Message header (client ID, time, message type)
+    #  @param now       Current time in seconds (time.perf_counter), None to read the clock
+    #  @param force     Take all pending records, ignoring the send intervals
+    #  @returns         List of messages, empty if nothing is due
+    def take_messages(self, header: bytes, now: float = None, force: bool = False) -> list[bytes]:
+        if now == None:
+            now = time.perf_counter()
+        # forget the parameters whose interval has passed, they can be sent right away
+        expired = [key for key, (sent, interval) in self.__last_sent.items() if now - sent >= interval * self.interval_scale]
+        for key in expired:
+            del self.__last_sent[key]
+        due = [key for key in self.__records if force or key not in self.__last_sent]
+
+        messages = []
+        message = bytearray(header)
+        for key in due:
+            record = self.__records.pop(key)
+            self.__last_sent[key] = (now, self.__intervals.pop(key))
+            if len(message) > len(header) and len(message) + len(record) > self.max_message_size:
+                messages.append(bytes(message))
+                message = bytearray(header)
+            message.extend(record)
+        if len(message) > len(header):
+            messages.append(bytes(message))
+
+        self.records_sent += len(due)
+        self.messages_sent += len(messages)
+        return messages
@@ -0,0 +1,149 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+## Benchmark of the character animation bake
+#  Builds a random armature, fills the bone parameters of its SceneObjectCharacter with keys
+#  (rotation of every bone, location of the hip) and times populate_timeline_with_animation.
+#  The baked channels are then written again into empty actions, once with the bulk F-curve
+#  writes of animationBake and once with keyframe_insert per bone and key, as before the bulk writes.
+#  Run from the repository root, with Blender's Python or the bpy module:
+#      python -m benchmarks.profileAnimationBake [bones] [keys] [--profile]
+
+import random
+import sys
+import time
+import bpy
+import numpy as np
+from mathutils import Quaternion, Vector
+
+from Blender import register
+from Blender.AbstractParameter import Key
+from Blender.QuickProfile import QuickProfiler
+from Blender.animationBake import write_fcurves
+from Blender.SceneObjects.SceneObjectCharacter import SceneObjectCharacter
+
+## Builds an armature with a random bone hierarchy, the first bone is the hip
+def build_rig(name: str, n_bones: int) -> bpy.types.Object:
+    armature = bpy.data.armatures.new(name)
+    obj = bpy.data.objects.new(name, armature)
+    bpy.context.scene.collection.objects.link(obj)
+    bpy.context.view_layer.objects.active = obj
+    bpy.ops.object.mode_set(mode='EDIT')
+    rnd = random.Random(1)
+    bones = []
+    for i in range(n_bones):
+        bone = armature.edit_bones.new("hip" if i == 0 else f"bone_{i}")
+        bone.head = (rnd.random(), rnd.random(), i * 0.1)
+        bone.tail = (bone.head[0], bone.head[1] + 0.1, i * 0.1 + 0.05)
+        if i > 0:
+            bone.parent = bones[rnd.randrange(max(0, i - 3), i)]
+        bones.append(bone)
+    bpy.ops.object.mode_set(mode='OBJECT')
+    return obj
+
+## Keys the rotation of every bone and the location of the hip, one key per frame
+def animate(character: SceneObjectCharacter, n_keys: int):
+    rnd = random.Random(2)
+    for parameter in character.parameter_list:
+        bone_name, param_type = parameter.name.split("-")
+        if param_type == "rotation_quaternion" or (bone_name == "hip" and param_type == "location"):
+            parameter.init_animation()
+            parameter.key_list.clear()
+            for frame in range(n_keys):
+                if param_type == "location":
+                    value = Vector((rnd.random(), rnd.random(), rnd.random()))
+                else:
+                    value = Quaternion((1, rnd.uniform(-.3, .3), rnd.uniform(-.3, .3), rnd.uniform(-.3, .3))).normalized()
+                parameter.key_list.add_key(Key(float(frame), value))
+
+## Reads the keys of an action back as channels
+#  @returns     Data path -> (frames, values (keys, array length))
+def read_channels(action: bpy.types.Action) -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    curves: dict[str, list] = {}
+    for fcurve in action.fcurves:
+        curves.setdefault(fcurve.data_path, []).append(fcurve)
+    channels = {}
+    for data_path, fcurves in curves.items():
+        fcurves.sort(key=lambda fcurve: fcurve.array_index)
+        co = np.empty((len(fcurves), 2 * len(fcurves[0].keyframe_points)), dtype=np.float32)
+        for i, fcurve in enumerate(fcurves):
+            fcurve.keyframe_points.foreach_get('co', co[i])
+        channels[data_path] = (co[0, 0::2], co[:, 1::2].T.copy())
+    return channels
+
+## Writes channels with the bulk F-curve writes
+def write_bulk(obj: bpy.types.Object, channels: dict):
+    obj.animation_data_create().action = bpy.data.actions.new("Bulk")
+    for data_path, (frames, values) in channels.items():
+        write_fcurves(obj.animation_data.action, data_path, frames, values)
+
+## Writes channels with keyframe_insert, one bone and one key at a time
+def write_per_key(obj: bpy.types.Object, channels: dict):
+    obj.animation_data_create().action = bpy.data.actions.new("Per Key")
+    for data_path, (frames, values) in channels.items():
+        bone_path, attribute = data_path.rsplit(".", 1)
+        pose_bone = obj.path_resolve(bone_path)
+        for frame, value in zip(frames, values):
+            setattr(pose_bone, attribute, value)
+            pose_bone.keyframe_insert(data_path=attribute, frame=float(frame))
+
+def timed(label: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"{label}: {time.perf_counter() - start:.3f} s")
+    return result
+
+def main(args: list[str]):
+    profile = "--profile" in args
+    counts = [int(arg) for arg in args if not arg.startswith("--")]
+    n_bones, n_keys = (counts + [70, 600][len(counts):])[:2]
+
+    register()
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    bpy.data.collections.new("TRACER_Collection")
+    obj = build_rig("Rig", n_bones)
+    character = SceneObjectCharacter(obj)
+    animate(character, n_keys)
+    print(f"{n_bones} bones, {n_keys} keys")
+
+    populate = QuickProfiler(character.populate_timeline_with_animation) if profile else character.populate_timeline_with_animation
+    timed("populate_timeline_with_animation", populate)
+
+    channels = read_channels(obj.animation_data.action)
+    timed("bulk F-curve writes", write_bulk, build_rig("Rig_Bulk", n_bones), channels)
+    timed("keyframe_insert per bone and key", write_per_key, build_rig("Rig_Per_Key", n_bones), channels)
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,116 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+## Micro-benchmark of the TRACER message codec
+#  Compares the precompiled encoders and decoders of messageCodec with the per-field
+#  struct.pack / struct.unpack code they replaced (reproduced below) and checks that
+#  both produce the same bytes.
+#  Run from the repository root, with Blender's Python or the bpy module:
+#      python -m benchmarks.profileCodec [iterations]
+
+import struct
+import sys
+import timeit
+
+from Blender.messageCodec import RECORD_HEADER, encode_header, encode_record, encode_lock, decode_record
+
+PAYLOAD = struct.pack('<3f', 1.0, 2.0, 3.0)
+RECORDS_PER_MESSAGE = 50
+
+def record_per_field() -> bytes:
+    record = bytearray([])
+    record.extend(struct.pack(' B', 1))
+    record.extend(struct.pack('<H', 42))
+    record.extend(struct.pack('<H', 3))
+    record.extend(struct.pack(' B', 5))
+    record.extend(struct.pack('<I', RECORD_HEADER.size + len(PAYLOAD)))
+    record.extend(PAYLOAD)
+    return bytes(record)
+
+def record_precompiled() -> bytes:
+    return encode_record(1, 42, 3, 5, RECORD_HEADER.size + len(PAYLOAD), PAYLOAD)
+
+def lock_per_field() -> bytes:
+    msg = bytearray([])
+    for fmt, value in (('B', 1), ('B', 7), ('B', 1), ('B', 1), ('H', 42), ('B', 1)):
+        msg.extend(struct.pack(fmt, value))
+    return bytes(msg)
+
+def lock_precompiled() -> bytes:
+    return encode_lock(1, 7, 1, 1, 42, True)
+
+MESSAGE = encode_header(2, 3, 0) + record_precompiled() * RECORDS_PER_MESSAGE
+
+def decode_per_field() -> list:
+    start = 3
+    payloads = []
+    while start < len(MESSAGE):
+        fields = (struct.unpack('B', MESSAGE[start:start+1])[0],        # scene ID
+                  struct.unpack('<H', MESSAGE[start+1:start+3])[0],     # object ID
+                  struct.unpack('<H', MESSAGE[start+3:start+5])[0],     # parameter ID
+                  struct.unpack('B', MESSAGE[start+5:start+6])[0])      # parameter type
+        length = struct.unpack('<I', MESSAGE[start+6:start+10])[0]
+        payloads.append((fields, MESSAGE[start+10:start+length]))
+        start += length
+    return payloads
+
+def decode_precompiled() -> list:
+    view = memoryview(MESSAGE)
+    start = 3
+    payloads = []
+    while start + RECORD_HEADER.size <= len(MESSAGE):
+        *_, length, payload = decode_record(view, start)
+        payloads.append(payload)
+        start += length
+    return payloads
+
+def main(args: list[str]):
+    iterations = int(args[0]) if len(args) > 0 else 200000
+    assert record_per_field() == record_precompiled()
+    assert lock_per_field() == lock_precompiled()
+    assert [bytes(p) for p in decode_precompiled()] == [payload for fields, payload in decode_per_field()]
+
+    for label, function, number in (
+            ("record encode, per field", record_per_field, iterations),
+            ("record encode, precompiled", record_precompiled, iterations),
+            ("lock encode, per field", lock_per_field, iterations),
+            ("lock encode, precompiled", lock_precompiled, iterations),
+            (f"decode {RECORDS_PER_MESSAGE}-record message, per field", decode_per_field, iterations // RECORDS_PER_MESSAGE),
+            (f"decode {RECORDS_PER_MESSAGE}-record message, precompiled", decode_precompiled, iterations // RECORDS_PER_MESSAGE)):
+        seconds = timeit.timeit(function, number=number)
+        print(f"{label}: {number / seconds:,.0f}/s")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
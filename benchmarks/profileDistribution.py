@@ -0,0 +1,115 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+## Load test of the scene distribution with several clients
+#  Every client is a REQ socket that requests the scene part by part, as the TRACER clients
+#  do. The server side is ticked like the Blender timer: the DistributionServer on a ROUTER
+#  socket every 10 ms, compared against the former REP socket answering one request per
+#  100 ms tick. Reports the time until the slowest client and the mean client has the full scene.
+#  Run from the repository root, with Blender's Python or the bpy module and pyzmq:
+#      python -m benchmarks.profileDistribution [clients ...] [--objects-mb N]
+
+import sys
+import threading
+import time
+import zmq
+
+from Blender.distributionServer import DistributionServer, SCENE_REQUESTS
+
+## Serves the scene to a number of concurrent clients
+#
+#  @param payloads Scene part name -> reply bytes
+#  @param n_clients Number of concurrent REQ clients
+#  @param use_router Serve with the DistributionServer, otherwise with a REP socket
+#  @returns Time of the slowest client and mean time to the full scene in seconds
+def run(payloads: dict, n_clients: int, use_router: bool) -> tuple[float, float]:
+    context = zmq.Context()
+    server_socket = context.socket(zmq.ROUTER if use_router else zmq.REP)
+    port = server_socket.bind_to_random_port("tcp://127.0.0.1")
+    server = DistributionServer(server_socket)
+    running = True
+
+    def tick():
+        while running:
+            if use_router:
+                server.serve(payloads)
+                time.sleep(0.01)
+            else:
+                if server_socket.poll(0):
+                    request = server_socket.recv_string()
+                    server_socket.send(payloads.get(request, b""))
+                time.sleep(0.1)
+
+    times = []
+    def client():
+        socket = context.socket(zmq.REQ)
+        socket.connect(f"tcp://127.0.0.1:{port}")
+        start = time.perf_counter()
+        for request in SCENE_REQUESTS:
+            socket.send_string(request)
+            socket.recv()
+        times.append(time.perf_counter() - start)
+        socket.close()
+
+    server_thread = threading.Thread(target=tick)
+    server_thread.start()
+    clients = [threading.Thread(target=client) for _ in range(n_clients)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    running = False
+    server_thread.join()
+    server_socket.close()
+    context.term()
+    return max(times), sum(times) / n_clients
+
+def main(args: list[str]):
+    objects_mb = 20
+    if "--objects-mb" in args:
+        i = args.index("--objects-mb")
+        objects_mb = int(args[i + 1])
+        del args[i:i + 2]
+    client_counts = [int(arg) for arg in args] or [1, 8]
+
+    payloads = {request: bytes(objects_mb * 1024 * 1024 if request == "objects" else 200 * 1024)
+                for request in SCENE_REQUESTS}
+    for n_clients in client_counts:
+        for label, use_router in (("REP", False), ("ROUTER", True)):
+            slowest, mean = run(payloads, n_clients, use_router)
+            print(f"{n_clients} clients, {label}: slowest {slowest:.2f} s, mean {mean:.2f} s")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,125 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+## Measures the object lookups of gather_scene_data
+#  Builds a synthetic scene under "TRACER Scene Root" (empties plus armatures whose bones
+#  are mirrored by empties of the same name), times the bone name resolution with the
+#  per-gather object index against the linear scan it replaced, and times a full gather.
+#  Run from the repository root, with Blender's Python or the bpy module:
+#      python -m benchmarks.profileGather [objects] [rigs] [bones per rig] [--profile]
+
+import sys
+import time
+import bpy
+
+from Blender import register
+from Blender.QuickProfile import QuickProfiler
+from Blender.sceneDistribution import gather_scene_data
+
+## Builds the synthetic scene
+#
+#  @param n_objects Number of empties, bone empties included
+#  @param n_rigs Number of armatures
+#  @param n_bones Number of bones per armature
+def build_scene(n_objects: int, n_rigs: int, n_bones: int):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    root = bpy.data.objects.new("TRACER Scene Root", None)
+    bpy.context.scene.collection.objects.link(root)
+    for i in range(n_objects):
+        obj = bpy.data.objects.new(f"Object_{i}", None)
+        obj.parent = root
+        bpy.context.scene.collection.objects.link(obj)
+
+    for r in range(n_rigs):
+        armature = bpy.data.armatures.new(f"Rig_{r}")
+        obj = bpy.data.objects.new(f"Rig_{r}", armature)
+        obj.parent = root
+        bpy.context.scene.collection.objects.link(obj)
+        bpy.context.view_layer.objects.active = obj
+        bpy.ops.object.mode_set(mode='EDIT')
+        for b in range(n_bones):
+            bone = armature.edit_bones.new(f"Object_{(r * n_bones + b) % n_objects}")
+            bone.head = (0, 0, b * 0.1)
+            bone.tail = (0, 0.1, b * 0.1)
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+## Resolves every bone name to its transfer index, as process_character does
+#
+#  @param objects The objects to transfer
+#  @param rigs The armature objects
+#  @param indexed Use a name index instead of scanning the object list
+def resolve_bones(objects: list, rigs: list, indexed: bool) -> list[int]:
+    mapping = []
+    if indexed:
+        index = {}
+        for i, obj in enumerate(objects):
+            index.setdefault(obj.name, i)
+        for rig in rigs:
+            for bone in rig.data.bones:
+                mapping.append(index.get(bone.name, -1))
+    else:
+        for rig in rigs:
+            for bone in rig.data.bones:
+                bone_index = -1
+                for i, obj in enumerate(objects):
+                    if obj.name == bone.name:
+                        bone_index = i
+                        break
+                mapping.append(bone_index)
+    return mapping
+
+def main(args: list[str]):
+    profile = "--profile" in args
+    counts = [int(arg) for arg in args if not arg.startswith("--")]
+    n_objects, n_rigs, n_bones = (counts + [10000, 10, 200][len(counts):])[:3]
+
+    register()
+    build_scene(n_objects, n_rigs, n_bones)
+    objects = bpy.data.objects["TRACER Scene Root"].children_recursive
+    rigs = [obj for obj in objects if obj.type == 'ARMATURE']
+    print(f"{len(objects)} objects, {n_rigs} rigs with {n_bones} bones")
+
+    for label, indexed in (("linear scan", False), ("name index", True)):
+        start = time.perf_counter()
+        resolve_bones(objects, rigs, indexed)
+        print(f"bone lookup, {label}: {time.perf_counter() - start:.3f} s")
+
+    gather = QuickProfiler(gather_scene_data) if profile else gather_scene_data
+    start = time.perf_counter()
+    gather()
+    print(f"gather_scene_data: {time.perf_counter() - start:.3f} s")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,104 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+## Measures the speedup of the geometry worker pool
+#  Builds a scene of distinct meshes (copies of one UV sphere, each with its own datablock) under
+#  "TRACER Scene Root" and times gather_scene_data with different numbers of worker threads.
+#  The geometry cache is disabled, so every mesh is processed on every gather. Speedups are relative
+#  to the first worker count. The share of process_geometry (the part the pool runs in parallel) in the
+#  serial gather gives the upper bound of the speedup on a number of cores (Amdahl's law).
+#  Run from the repository root, with Blender's Python or the bpy module:
+#      python -m benchmarks.profileGeometryPool [meshes] [workers ...] [--cores N]
+
+import os
+import sys
+import time
+import bpy
+
+from Blender import register
+from Blender.geoProcessing import read_mesh_data, process_geometry
+from Blender.sceneDistribution import gather_scene_data
+
+## Builds the scene
+#  @param n_meshes  Number of mesh objects, each with its own mesh datablock
+def build_scene(n_meshes: int):
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    root = bpy.data.objects.new("TRACER Scene Root", None)
+    bpy.context.scene.collection.objects.link(root)
+    bpy.ops.mesh.primitive_uv_sphere_add(segments=64, ring_count=32)
+    sphere = bpy.context.active_object
+    for i in range(n_meshes):
+        obj = bpy.data.objects.new(f"Mesh_{i}", sphere.data.copy())
+        obj.parent = root
+        bpy.context.scene.collection.objects.link(obj)
+    bpy.data.objects.remove(sphere)
+
+def main(args: list[str]):
+    cores = 8
+    if "--cores" in args:
+        i = args.index("--cores")
+        cores = int(args[i + 1])
+        del args[i:i + 2]
+    counts = [int(arg) for arg in args]
+    n_meshes = counts[0] if len(counts) > 0 else 500
+    worker_counts = counts[1:] or sorted({1, os.cpu_count() or 1})
+
+    register()
+    build_scene(n_meshes)
+    tracer_props = bpy.context.scene.tracer_properties
+    tracer_props.use_geo_cache = False
+    print(f"{n_meshes} meshes, {os.cpu_count()} cores")
+
+    serial = None
+    for workers in worker_counts:
+        tracer_props.worker_count = workers
+        seconds = min(timed_gather() for _ in range(3))
+        serial = serial or seconds
+        print(f"{workers} worker threads: {seconds:.2f} s (x{serial / seconds:.2f})")
+
+    raws = [read_mesh_data(obj.data) for obj in bpy.data.objects if obj.type == 'MESH']
+    start = time.perf_counter()
+    for raw in raws:
+        process_geometry(raw, tracer_props.weld_tolerance)
+    share = (time.perf_counter() - start) / serial
+    print(f"process_geometry: {share:.0%} of the gather, upper bound on {cores} cores: x{1 / (1 - share + share / cores):.2f}")
+
+def timed_gather() -> float:
+    start = time.perf_counter()
+    gather_scene_data()
+    return time.perf_counter() - start
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,109 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+## Benchmark of the keyframe evaluation
+#  Builds animated VECTOR3 and QUATERNION parameters whose keys share times, key types and
+#  tangent times (as the bones of an AnimHost clip do), with a share of bezier keys, and samples
+#  them with evaluate_parameters (grouped), with evaluate_parameter (one parameter at a time)
+#  and with Parameter.evaluate (one parameter and one time at a time).
+#  Run from the repository root, with Blender's Python or the bpy module:
+#      python -m benchmarks.profileKeyEvaluation [parameters] [keys] [samples] [bezier share]
+
+import sys
+import time
+import numpy as np
+
+# the add-on imports bpy first, mathutils is only available after it with the bpy module
+from Blender.AbstractParameter import Parameter, KeyType
+from Blender.keyEvaluation import evaluate_parameter, evaluate_parameters
+from mathutils import Vector, Quaternion
+
+## Builds animated parameters sharing their key times, key types and tangent times
+#
+#  @param n_parameters Number of parameters, half VECTOR3 and half QUATERNION
+#  @param n_keys Number of keys per parameter
+#  @param bezier_share Share of the keys of type BEZIER, the others are LINEAR
+def build_parameters(n_parameters: int, n_keys: int, bezier_share: float) -> list[Parameter]:
+    rng = np.random.default_rng(1)
+    times = np.arange(n_keys, dtype=np.float32)
+    types = np.where(rng.random(n_keys) < bezier_share, KeyType.BEZIER.value, KeyType.LINEAR.value).astype(np.uint8)
+    parameters = []
+    for i in range(n_parameters):
+        if i % 2 == 0:
+            parameter = Parameter(Vector((0.0, 0.0, 0.0)), f"location_{i}")
+            values = rng.random((n_keys, 3), dtype=np.float32)
+        else:
+            parameter = Parameter(Quaternion(), f"rotation_{i}")
+            values = rng.normal(size=(n_keys, 4)).astype(np.float32)
+            values /= np.linalg.norm(values, axis=1, keepdims=True)
+        parameter.is_animated = True
+        parameter.key_list.set_columns({
+            'type': types,
+            'time': times,
+            'right_tangent_time': times + np.float32(1 / 3),
+            'left_tangent_time': times - np.float32(1 / 3),
+            'value': values,
+            'right_tangent_value': values,
+            'left_tangent_value': values,
+        })
+        parameters.append(parameter)
+    return parameters
+
+def main(args: list[str]):
+    defaults = [100, 600, 1000, 0.2]
+    values = [float(arg) for arg in args] + defaults[len(args):]
+    n_parameters, n_keys, n_samples = (int(value) for value in values[:3])
+    bezier_share = values[3]
+
+    parameters = build_parameters(n_parameters, n_keys, bezier_share)
+    times = np.linspace(-1.0, n_keys, n_samples)
+    print(f"{n_parameters} parameters, {n_keys} keys ({bezier_share:.0%} bezier), {n_samples} samples")
+
+    start = time.perf_counter()
+    grouped = evaluate_parameters(parameters, times)
+    print(f"evaluate_parameters: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    single = [evaluate_parameter(parameter, times) for parameter in parameters]
+    print(f"evaluate_parameter per parameter: {(time.perf_counter() - start) * 1000:.1f} ms")
+    assert all(np.allclose(a, b, atol=1e-5) for a, b in zip(grouped, single))
+
+    start = time.perf_counter()
+    for t in times:
+        parameters[0].evaluate(float(t))
+    print(f"Parameter.evaluate per sample: {(time.perf_counter() - start) * 1000:.1f} ms for one parameter")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,106 @@
+"""
+TRACER Scene Distribution Plugin Blender
+ 
+Copyright (c) 2024 Filmakademie Baden-Wuerttemberg, Animationsinstitut R&D Labs
+https://research.animationsinstitut.de/tracer
+https://github.com/FilmakademieRnd/TracerSceneDistribution
+ 
+TRACER Scene Distribution Plugin Blender is a development by Filmakademie
+Baden-Wuerttemberg, Animationsinstitut R&D Labs in the scope of the EU funded
+project MAX-R (101070072) and funding on the own behalf of Filmakademie
+Baden-Wuerttemberg.  Former EU projects Dreamspace (610005) and SAUCE (780470)
+have inspired the TRACER Scene Distribution Plugin Blender development.
+ 
+The TRACER Scene Distribution Plugin Blender is intended for research and
+development purposes only. Commercial use of any kind is not permitted.
+ 
+There is no support by Filmakademie. Since the TRACER Scene Distribution Plugin
+Blender is available for free, Filmakademie shall only be liable for intent
+and gross negligence; warranty is limited to malice. TRACER Scene Distribution
+Plugin Blender may under no circumstances be used for racist, sexual or any
+illegal purposes. In all non-commercial productions, scientific publications,
+prototypical non-commercial software tools, etc. using the TRACER Scene
+Distribution Plugin Blender Filmakademie has to be named as follows: 
+"TRACER Scene Distribution Plugin Blender by Filmakademie
+Baden-Württemberg, Animationsinstitut (http://research.animationsinstitut.de)".
+ 
+In case a company or individual would like to use the TRACER Scene Distribution
+Plugin Blender in a commercial surrounding or for commercial purposes,
+software based on these components or  any part thereof, the company/individual
+will have to contact Filmakademie (research<at>filmakademie.de) for an
+individual license agreement.
+ 
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+"""
+
+## Measures how fast the listener drains received parameter updates
+#  A PUB socket stands in for the TRACER server and sends single-record VECTOR3 updates of a
+#  few objects to the NetworkThread. The main loop runs like the listener timer: every 10 ms
+#  it takes messages for up to LISTENER_BUDGET and collects their records per parameter with
+#  collect_parameter_updates. Reports the received message rate, the number of records that
+#  would be deserialized into bpy and the messages dropped by the network thread.
+#  The former listener applied one message per 10 ms tick, about 100 messages per second.
+#  Run from the repository root, with Blender's Python or the bpy module and pyzmq:
+#      python -m benchmarks.profileListener [messages] [objects]
+
+import struct
+import sys
+import threading
+import time
+import zmq
+
+from Blender.AbstractParameter import TRACERParamType
+from Blender.networkThread import NetworkThread
+from Blender.serverAdapter import LISTENER_BUDGET, MessageType, collect_parameter_updates
+
+def main(args: list[str]):
+    counts = [int(arg) for arg in args]
+    n_messages, n_objects = (counts + [50000, 10][len(counts):])[:2]
+
+    context = zmq.Context()
+    publisher = context.socket(zmq.PUB)
+    sync_port = publisher.bind_to_random_port("tcp://127.0.0.1")
+    network = NetworkThread("127.0.0.1", "0", str(sync_port), "0")
+    network.start()
+    time.sleep(0.3)     # let the subscriber connect
+
+    # header (client ID, time, message type) and one record (scene ID, object ID, parameter ID, type, length, VECTOR3 value)
+    messages = [struct.pack('<BBBBHHBI3f', 7, 0, MessageType.PARAMETERUPDATE.value, 1, i + 1, 0,
+                            TRACERParamType.VECTOR3.value, 22, 1.0, 2.0, 3.0)
+                for i in range(n_objects)]
+
+    def send():
+        for i in range(n_messages):
+            publisher.send(messages[i % n_objects])
+            if i % 100 == 0:
+                time.sleep(0.001)
+
+    received = ticks = applied = 0
+    max_drain = 0.0
+    start = time.perf_counter()
+    threading.Thread(target=send).start()
+    while received < n_messages and time.perf_counter() - start < 30:
+        tick_start = time.perf_counter()
+        updates = {}
+        message = network.receive()
+        while message != None:
+            received += 1
+            collect_parameter_updates(message.data, updates, 3)
+            if time.perf_counter() - tick_start >= LISTENER_BUDGET:
+                break
+            message = network.receive()
+        applied += len(updates)
+        ticks += 1
+        max_drain = max(max_drain, time.perf_counter() - tick_start)
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+
+    print(f"{received} of {n_messages} messages in {elapsed:.2f} s ({received / elapsed:.0f} msg/s) over {ticks} ticks")
+    print(f"records to deserialize: {applied}, dropped by the network thread: {network.dropped_inbound}, "
+          f"longest drain: {max_drain * 1000:.1f} ms")
+    network.stop()
+    publisher.close()
+    context.term()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
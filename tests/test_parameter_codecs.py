@@ -0,0 +1,17 @@
+# Run from the repository root with Blender's Python or the bpy module: python -m pytest tests
+import struct
+import pytest
+
+pytest.importorskip("bpy")
+
+from mathutils import Vector, Color
+from Blender.AbstractParameter import PARAMETER_CODECS, TRACERParamType
+
+def test_color_is_decoded_from_rgba():
+    color = PARAMETER_CODECS[TRACERParamType.COLOR.value].decode(struct.pack('<4f', 0.25, 0.5, 0.75, 1.0))
+    assert isinstance(color, Color)
+    assert tuple(color) == (0.25, 0.5, 0.75)
+
+def test_vector4_is_decoded_as_wxyz():
+    vector = PARAMETER_CODECS[TRACERParamType.VECTOR4.value].decode(struct.pack('<4f', 1.0, 2.0, 3.0, 4.0))
+    assert vector == Vector((4.0, 1.0, 2.0, 3.0))